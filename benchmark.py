@@ -0,0 +1,234 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from cv_to_json import create_gemini_payload_config, parse_cv_text
+from json_to_sql import generate_sql_script
+from json_to_pptx import (TEMPLATE_FILE, TEMPLATE_SHAPE_NAMES, CompiledTemplate, find_in_shapes,
+                          update_footer_block, update_role_block)
+
+# --- CONFIGURATION ---
+RESULTS_DIR = "benchmark_results"
+SIZES = [1, 100, 10_000]
+REPEATS = 3  # each stage is timed this many times; the fastest run is kept
+MOCK_LATENCY_SECONDS = 0.02
+MOCK_CONCURRENCY = 32
+SEED = 42
+
+# The slow stages are timed on at most this many profiles per size (see --full)
+STAGE_LIMITS = {"mock_gemini": 2_000, "find_in_shapes": 200, "update_blocks": 500, "prs_save": 200}
+
+# --- SYNTHETIC PROFILE VOCABULARY ---
+SENIORITY = ["Fractional", "Interim", "Group", "Regional", "Global", "Executive"]
+FUNCTIONS = ["CFO", "CTO", "COO", "CHRO", "CMO", "Chief Risk Officer", "Head of Internal Audit", "Managing Director"]
+TAGLINES = ["Strategic Financial Leader", "Transformation Executive", "Growth & Scale-up Advisor",
+            "Operational Excellence Leader", "Digital Transformation Leader", "Turnaround Specialist"]
+SECTORS = ["Banking", "Financial Services", "Insurance", "Leasing", "FMCG", "Manufacturing", "Retail", "SaaS",
+           "Telecommunications", "Energy", "Pharmaceuticals", "Logistics", "Real Estate", "Private Equity"]
+REGIONS = ["Romania", "Germany", "United Kingdom", "Poland", "Netherlands", "Central & Eastern Europe",
+           "North America", "Nordics", "DACH Region"]
+WORK_MODES = ["Remote", "Hybrid", "Remote/Hybrid", "On-site"]
+FIRM_TYPES = ["a Digital Banking Institution", "a Regional Banking Group", "a Global Consulting Firm",
+              "a Leading Technology Group", "a Private Equity Fund", "a Captive Finance and Leasing Group",
+              "a Fortune 500 Manufacturer", "a Fast-Growing SaaS Provider", "a National Energy Utility"]
+ROLE_PREFIXES = ["Senior Executive at", "Pivotal Leader in", "Board Member at", "Strategic Executive at",
+                 "Turnaround Lead at", "Founding Executive at"]
+ACHIEVEMENTS = [
+    "Managed budgets up to {n} million EUR and ensured regulatory compliance.",
+    "Led the integration of {k} acquired entities into a single operating model.",
+    "Reduced operating costs by {p}% through process automation and shared services.",
+    "Raised {n} million EUR in growth financing from institutional investors.",
+    "Implemented a new reporting platform across {k} countries.",
+    "Grew annual revenue by {p}% over {k} years while improving margins.",
+    "Built and led a team of {n} professionals across finance and operations.",
+    "Cut month-end close from {k} weeks to {p} days.",
+]
+STRENGTHS = ["Financial Leadership & Strategy", "Regulatory Compliance & Internal Controls", "M&A Integration",
+             "Digital Transformation & System Implementation", "Audit & Risk Management", "Capital Markets",
+             "Cost Optimization", "Board Reporting & Governance", "Team Building & Leadership", "Treasury Management",
+             "Investor Relations", "Post-Merger Integration", "ERP Implementation (SAP)"]
+
+
+def synthetic_profile(rng: random.Random) -> dict:
+    """One realistic, schema-valid profile (3-4 roles, 2-3 achievements each, 3-4 strengths)."""
+    def achievement():
+        return rng.choice(ACHIEVEMENTS).format(n=rng.randint(2, 500), k=rng.randint(2, 12), p=rng.randint(5, 60))
+
+    return {
+        "title": f"{rng.choice(SENIORITY)} {rng.choice(FUNCTIONS)} | {rng.choice(TAGLINES)}",
+        "gender": rng.choice(["Female", "Male"]),
+        "experience_summary": f"{rng.randint(10, 35)}+ years in {rng.choice(SECTORS).lower()} and executive leadership.",
+        "sector_focus": ", ".join(rng.sample(SECTORS, rng.randint(2, 4))),
+        "location": f"{rng.choice(REGIONS)} ({rng.choice(WORK_MODES)})",
+        "experience": [
+            {
+                "job_title": f"{rng.choice(SENIORITY)} {rng.choice(FUNCTIONS)}",
+                "description": f"{rng.choice(ROLE_PREFIXES)} {rng.choice(FIRM_TYPES)}",
+                "achievements": [achievement() for _ in range(rng.randint(2, 3))],
+            }
+            for _ in range(rng.randint(3, 4))
+        ],
+        "core_strengths": rng.sample(STRENGTHS, rng.randint(3, 4)),
+    }
+
+
+def synthetic_profiles(count: int, seed: int = SEED) -> list[dict]:
+    rng = random.Random(seed)
+    return [synthetic_profile(rng) for _ in range(count)]
+
+
+class MockGeminiClient:
+    """
+    Stands in for genai.Client: generate_content sleeps for `latency` seconds
+    (± `jitter`) and answers with the next synthetic profile as JSON text, so
+    parse_cv_text runs exactly as it does against the real API.
+    """
+
+    def __init__(self, profiles: list[dict], latency: float = MOCK_LATENCY_SECONDS, jitter: float = 0.0):
+        self.models = self
+        self._responses = [json.dumps(p) for p in profiles]
+        self._next = 0
+        self.latency = latency
+        self.jitter = jitter
+
+    def generate_content(self, model, contents, config):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        text = self._responses[self._next % len(self._responses)]
+        self._next += 1
+        return type("MockResponse", (), {"text": text})()
+
+
+def _best_of(repeats: int, fn) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_stages(profiles: list[dict], repeats: int = REPEATS, latency: float = MOCK_LATENCY_SECONDS,
+                     concurrency: int = MOCK_CONCURRENCY, limits: dict | None = None,
+                     template_file: str = TEMPLATE_FILE) -> list[dict]:
+    """Times each pipeline stage over `profiles`; returns one result row per stage."""
+    limits = STAGE_LIMITS if limits is None else limits
+    texts = [json.dumps(p, indent=4) for p in profiles]
+    template = CompiledTemplate(template_file)
+    shapes = template.slide.shapes
+    role_shapes = [template.find_shape(f"role_{i}") for i in range(1, 5)]
+    footer_shape = template.find_shape("footer_strengths")
+    _, config = create_gemini_payload_config()
+
+    def mock_gemini(items):
+        client = MockGeminiClient(items, latency)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda _: parse_cv_text(client, config, "synthetic cv"), items))
+
+    def find_shapes(items):
+        for _ in items:
+            for name in TEMPLATE_SHAPE_NAMES:
+                find_in_shapes(shapes, name)
+
+    def update_blocks(items):
+        for data in items:
+            for shape, role in zip(role_shapes, data["experience"]):
+                update_role_block(shape, role)
+            update_footer_block(footer_shape, data["core_strengths"])
+
+    def prs_save(items):
+        for data in items:
+            template.render(data, io.BytesIO())
+
+    stages = [
+        ("json_parse", lambda items: [json.loads(t) for t in items], texts),
+        ("generate_sql_script", lambda items: [generate_sql_script(p) for p in items], profiles),
+        ("mock_gemini", mock_gemini, profiles),
+        ("find_in_shapes", find_shapes, profiles),
+        ("update_blocks", update_blocks, profiles),
+        # A full render (reset + fill + save): the save dominates it
+        ("prs_save", prs_save, profiles),
+    ]
+    rows = []
+    for name, fn, items in stages:
+        items = items[:limits[name]] if name in limits else items
+        # Network-bound stages are not worth repeating
+        seconds = _best_of(1 if name == "mock_gemini" else repeats, lambda: fn(items))
+        rows.append({
+            "stage": name,
+            "profiles": len(items),
+            "seconds": round(seconds, 6),
+            "ms_per_profile": round(seconds * 1000 / len(items), 4),
+            "profiles_per_second": round(len(items) / seconds, 1) if seconds > 0 else None,
+        })
+        print(f"  {name:<20} {len(items):>6} profiles  {rows[-1]['ms_per_profile']:>10.4f} ms/profile")
+    return rows
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "commit": commit or None,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(baseline: dict, current: dict):
+    """Prints the per-profile time change of every stage/size present in both result files."""
+    old = {(r["size"], r["stage"]): r["ms_per_profile"] for r in baseline["results"]}
+    print(f"\n--- ⚖️ Against {baseline['environment'].get('commit') or 'baseline'} ---")
+    for row in current["results"]:
+        before = old.get((row["size"], row["stage"]))
+        if before:
+            change = row["ms_per_profile"] / before - 1
+            flag = "⚠️" if change > 0.1 else "  "
+            print(f"{flag} size {row['size']:>6} {row['stage']:<20} {before:>10.4f} -> {row['ms_per_profile']:>10.4f} ms ({change:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic profiles.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--latency", type=float, default=MOCK_LATENCY_SECONDS, help="Mocked Gemini seconds per call")
+    parser.add_argument("--concurrency", type=int, default=MOCK_CONCURRENCY, help="Mocked Gemini calls in flight")
+    parser.add_argument("--full", action="store_true", help="Time the slow stages on every profile too")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="Result JSON path (default: a timestamped file in benchmark_results/)")
+    parser.add_argument("--compare", help="An earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    limits = {} if args.full else STAGE_LIMITS
+    report = {
+        "environment": environment(),
+        "settings": {"repeats": args.repeats, "latency": args.latency, "concurrency": args.concurrency,
+                     "seed": args.seed, "stage_limits": limits},
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"--- ⏱️ {size} profiles ---")
+        profiles = synthetic_profiles(size, args.seed)
+        for row in benchmark_stages(profiles, args.repeats, args.latency, args.concurrency, limits):
+            report["results"].append({"size": size, **row})
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w') as f:
+        f.write(json.dumps(report, indent=4))
+    print(f"\nResults saved to '{output}'.")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+
+from cv_batch import add_backend_arguments, build_backend, collect_cv_files, print_backend_report, run_batch
+from cv_cache import config_fingerprint
+from cv_to_json import MODEL_NAME, create_gemini_payload_config
+from json_to_sql import generate_sql_script
+from pipeline import OUTPUT_DIR, profile_paths
+from telemetry import add_telemetry_arguments, instrumented_run
+
+# --- CONFIGURATION ---
+MANIFEST_FILE = "build_manifest.json"  # lives inside the output directory
+TEMPLATE_FILE = "template.pptx"  # json_to_pptx's default; not imported from there so --no-pptx never loads python-pptx
+
+
+def file_hash(path: str) -> str | None:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def prompt_hash(model_name: str, config, settings: dict | None = None) -> str:
+    """
+    Hash of the model name, schema, system prompt and temperature the JSON step
+    is built with, plus any backend `settings` that change its output.
+    """
+    payload = json.dumps({**config_fingerprint(model_name, config), "settings": settings or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def backend_settings(args) -> dict:
+    """The backend flags (see cv_batch.build_backend) that change the parsed JSON, not just how it is fetched."""
+    settings = {"preprocess": args.preprocess, "chunked": args.chunked, "validate": not args.no_validate}
+    if args.chunked:
+        settings["long_cv_chars"] = args.long_cv_chars
+    if not args.no_validate:
+        settings["repair_attempts"] = args.repair_attempts
+    if args.preprocess or not args.no_validate:
+        # Both the scrubber and the validator read the gazetteer
+        settings["gazetteer"] = file_hash(args.gazetteer)
+    return settings
+
+
+class BuildManifest:
+    """
+    Make-style record of what every output was built from.
+
+    For each output path it stores the content hashes of its inputs. An output is
+    stale when it is missing or any input hash differs from the recorded one.
+    Because inputs are compared by content, re-parsing a CV into byte-identical
+    JSON does not cascade into new SQL and decks.
+    """
+
+    def __init__(self, output_dir: str = OUTPUT_DIR):
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def stale_reason(self, output_path: str, inputs: dict) -> str | None:
+        """Why output_path needs rebuilding given its current input hashes, or None if it is up to date."""
+        if not os.path.exists(output_path):
+            return "output missing"
+        recorded = self.entries.get(output_path)
+        if recorded is None:
+            return "not in manifest"
+        changed = [name for name, digest in inputs.items() if recorded["inputs"].get(name) != digest]
+        return f"changed: {', '.join(changed)}" if changed else None
+
+    def record(self, output_path: str, inputs: dict):
+        self.entries[output_path] = {"inputs": inputs, "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(self.entries, indent=4))
+
+
+def plan_build(manifest: BuildManifest, cv_paths: list[str], output_dir: str, config_digest: str,
+               template_file: str = TEMPLATE_FILE, render_pptx: bool = True) -> list[dict]:
+    """
+    Works out which steps need to run, without running any of them.
+
+    Returns one entry per profile: its paths, each step's input hashes, and
+    `stale`, a {step: reason} dict for the steps that must be redone. A step whose
+    upstream JSON is stale is reported as stale too, since its input is about to change.
+    `config_digest` is the prompt_hash the JSON step would run with.
+    """
+    template_digest = file_hash(template_file) if render_pptx else None
+    plan = []
+    for cv_path in cv_paths:
+        profile_id = os.path.splitext(os.path.basename(cv_path))[0]
+        paths = profile_paths(output_dir, profile_id)
+        json_digest = file_hash(paths["json"])
+        inputs = {
+            "json": {"cv": file_hash(cv_path), "prompt": config_digest},
+            "sql": {"json": json_digest},
+        }
+        if render_pptx:
+            inputs["pptx"] = {"json": json_digest, "template": template_digest}
+
+        stale = {}
+        reason = manifest.stale_reason(paths["json"], inputs["json"])
+        if reason:
+            stale["json"] = reason
+        for step in [s for s in ("sql", "pptx") if s in inputs]:
+            reason = manifest.stale_reason(paths[step], inputs[step])
+            if reason or "json" in stale:
+                stale[step] = reason or "upstream json is being rebuilt"
+        plan.append({"profile_id": profile_id, "cv_path": cv_path, "paths": paths, "inputs": inputs, "stale": stale})
+    return plan
+
+
+def run_build(manifest: BuildManifest, plan: list[dict], backend, output_dir: str,
+              concurrency: int, dead_letter=None, template_file: str = TEMPLATE_FILE) -> dict:
+    """Runs only the stale steps of a plan, recording each output in the manifest as it lands."""
+    counts = {"json": 0, "sql": 0, "pptx": 0, "failed": 0}
+
+    # 1. Stale LLM calls, concurrently
+    to_parse = [entry for entry in plan if "json" in entry["stale"]]
+    parsed = run_batch(backend, [entry["cv_path"] for entry in to_parse], output_dir, concurrency, dead_letter)
+    failed = set()
+    for entry, result in zip(to_parse, parsed):
+        if result.error:
+            failed.add(entry["profile_id"])
+            counts["failed"] += 1
+        else:
+            manifest.record(entry["paths"]["json"], entry["inputs"]["json"])
+            counts["json"] += 1
+
+    # 2. SQL and decks, whose inputs now include the fresh JSON hash
+    template = None
+    for entry in plan:
+        steps = [step for step in ("sql", "pptx") if step in entry["stale"]]
+        if not steps or entry["profile_id"] in failed:
+            continue
+        paths = entry["paths"]
+        json_digest = file_hash(paths["json"])
+        with open(paths["json"], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for step in steps:
+            inputs = dict(entry["inputs"][step], json=json_digest)
+            # The fresh JSON may hash the same as before; then this output is still good
+            if manifest.stale_reason(paths[step], inputs) is None:
+                continue
+            try:
+                if step == "sql":
+                    with open(paths["sql"], 'w') as f:
+                        f.write(generate_sql_script(data))
+                else:
+                    if template is None:
+                        from json_to_pptx import CompiledTemplate
+                        template = CompiledTemplate(template_file)
+                    template.render(data, paths["pptx"])
+            except Exception as e:
+                print(f"❌ [{step}] {entry['profile_id']}: {type(e).__name__}: {e}")
+                counts["failed"] += 1
+                continue
+            manifest.record(paths[step], inputs)
+            counts[step] += 1
+    manifest.save()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild only the JSON, SQL and PPTX outputs whose inputs changed.")
+    parser.add_argument("source", help="Directory of *.txt CVs or a manifest file listing CV paths")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--template", default=TEMPLATE_FILE)
+    parser.add_argument("--no-pptx", action="store_true", help="Only track the JSON and SQL outputs")
+    parser.add_argument("--dry-run", action="store_true", help="Report what is stale and why, without rebuilding")
+    add_backend_arguments(parser)
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    cv_paths = collect_cv_files(args.source)
+    # Planning needs only the prompt hash; the backend (API key, cache) is built only to rebuild
+    config_digest = prompt_hash("stub" if args.stub else MODEL_NAME, create_gemini_payload_config()[1],
+                                backend_settings(args))
+    manifest = BuildManifest(args.output_dir)
+    plan = plan_build(manifest, cv_paths, args.output_dir, config_digest, args.template, not args.no_pptx)
+
+    stale = [entry for entry in plan if entry["stale"]]
+    print(f"--- 🧱 Incremental build: {len(stale)}/{len(plan)} profiles have stale outputs ---")
+    for entry in stale:
+        for step, reason in entry["stale"].items():
+            print(f"  {entry['profile_id']}.{step}: {reason}")
+
+    if args.dry_run or not stale:
+        print("\nNothing rebuilt." if not stale else "\nDry run: nothing rebuilt.")
+        return
+
+    backend, cache, dead_letter = build_backend(args)
+    with instrumented_run(args, "build"):
+        counts = run_build(manifest, plan, backend, args.output_dir, args.concurrency, dead_letter, args.template)
+    print("\n" + "="*50)
+    print(f"Rebuilt {counts['json']} JSON, {counts['sql']} SQL and {counts['pptx']} PPTX outputs; {counts['failed']} failed.")
+    print_backend_report(cache, dead_letter, backend)
+
+
+if __name__ == "__main__":
+    main()
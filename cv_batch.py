@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import argparse
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cv_to_json import MODEL_NAME, create_gemini_payload_config, load_api_key, parse_cv_text
+from cv_cache import CACHE_DIR, CVCache, CachedBackend
+from cv_preprocess import GAZETTEER_FILE, PreprocessingBackend, load_gazetteer
+from cv_chunked import LONG_CV_CHARS, ChunkedBackend
+from profile_validator import REPAIR_ATTEMPTS, REPAIR_QUEUE_FILE, ProfileValidator, RepairQueue, ValidatingBackend
+from telemetry import add_telemetry_arguments, count, instrumented_run, span
+from gemini_scheduler import (DEAD_LETTER_FILE, MAX_RETRIES, REQUEST_DEADLINE_SECONDS, REQUESTS_PER_MINUTE,
+                              TOKENS_PER_MINUTE, DeadLetterFile, RetryingBackend)
+
+# --- CONFIGURATION ---
+OUTPUT_DIR = "batch_output"
+DEFAULT_CONCURRENCY = 8
+STUB_PROFILE_FILE = "json_output.json"
+
+
+class GeminiBackend:
+    """One Gemini client and one prebuilt config, shared by every CV in the batch."""
+
+    def __init__(self, api_key: str, model_name: str = MODEL_NAME):
+        from google import genai
+
+        self.model_name = model_name
+        self.client = genai.Client(api_key=api_key)
+        self.system_prompt, self.config = create_gemini_payload_config()
+
+    def parse(self, cv_text: str, timeout: float | None = None, config=None) -> dict:
+        """`config` overrides the default one for a single call (e.g. the chunk schema, see cv_chunked)."""
+        return parse_cv_text(self.client, config or self.config, cv_text, self.model_name, timeout)
+
+
+class StubBackend:
+    """Offline stand-in for Gemini: sleeps for `latency` seconds and returns a canned profile."""
+
+    def __init__(self, profile_path: str = STUB_PROFILE_FILE, latency: float = 0.0):
+        self.model_name = "stub"
+        self.latency = latency
+        self.system_prompt, self.config = create_gemini_payload_config()
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            self.profile_text = f.read()
+
+    def parse(self, cv_text: str, timeout: float | None = None, config=None) -> dict:
+        if self.latency:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"stub request timed out after {timeout:.1f}s")
+            time.sleep(self.latency)
+        # Fresh dict per call so callers can mutate their copy safely
+        return json.loads(self.profile_text)
+
+
+@dataclass
+class CVResult:
+    cv_path: str
+    output_path: str
+    seconds: float
+    error: str | None = None
+
+
+def collect_cv_files(source: str) -> list[str]:
+    """
+    Returns the CV paths to process.
+
+    `source` is either a directory (every *.txt inside it) or a manifest file
+    listing one CV path per line; relative manifest paths resolve against the
+    manifest's own directory and lines starting with '#' are ignored.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source)) if name.endswith(".txt")]
+    else:
+        base_dir = os.path.dirname(os.path.abspath(source))
+        paths = []
+        with open(source, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+
+    # One JSON per CV is named after the CV, so stems must not collide
+    seen = {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem in seen:
+            raise ValueError(f"Duplicate CV name '{stem}': {seen[stem]} and {path}")
+        seen[stem] = path
+    return paths
+
+
+def output_path_for(cv_path: str, output_dir: str) -> str:
+    stem = os.path.splitext(os.path.basename(cv_path))[0]
+    return os.path.join(output_dir, stem + ".json")
+
+
+def process_cv(backend, cv_path: str, output_dir: str) -> CVResult:
+    """Parses a single CV and writes its JSON; errors are captured in the result, not raised."""
+    output_path = output_path_for(cv_path, output_dir)
+    start = time.perf_counter()
+    try:
+        with span("cv.process", cv_path=cv_path):
+            with open(cv_path, 'r', encoding='utf-8') as f:
+                cv_text = f.read()
+            json_output = backend.parse(cv_text)
+            with open(output_path, 'w') as f:
+                f.write(json.dumps(json_output, indent=4))
+    except Exception as e:
+        count("cvs_processed_total", result="failed")
+        return CVResult(cv_path, output_path, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    count("cvs_processed_total", result="ok")
+    return CVResult(cv_path, output_path, time.perf_counter() - start)
+
+
+def run_batch(backend, cv_paths: list[str], output_dir: str = OUTPUT_DIR,
+              concurrency: int = DEFAULT_CONCURRENCY, dead_letter: DeadLetterFile | None = None) -> list[CVResult]:
+    """
+    Parses every CV concurrently with at most `concurrency` requests in flight.
+
+    Failed CVs are appended to `dead_letter` when one is given.
+    Returns one CVResult per CV in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(process_cv, backend, path, output_dir): path for path in cv_paths}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.cv_path] = result
+            if result.error and dead_letter:
+                dead_letter.record(result.cv_path, result.error)
+            status = "❌" if result.error else "✅"
+            print(f"{status} {result.cv_path} ({result.seconds:.2f}s){' - ' + result.error if result.error else ''}")
+    return [results[path] for path in cv_paths]
+
+
+def add_backend_arguments(parser: argparse.ArgumentParser):
+    """CLI flags shared by every entry point that parses CVs (backend, rate limits, cache)."""
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub backend instead of Gemini")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Simulated seconds per stub call")
+    parser.add_argument("--rpm", type=float, default=REQUESTS_PER_MINUTE, help="Requests-per-minute quota")
+    parser.add_argument("--tpm", type=float, default=TOKENS_PER_MINUTE, help="Tokens-per-minute quota")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES)
+    parser.add_argument("--deadline", type=float, default=REQUEST_DEADLINE_SECONDS, help="Seconds allowed per CV, retries included")
+    parser.add_argument("--dead-letter", default=DEAD_LETTER_FILE, help="JSON-lines file for CVs that fail permanently")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parsed-CV cache")
+    parser.add_argument("--clear-cache", action="store_true", help="Invalidate the parsed-CV cache before running")
+    parser.add_argument("--preprocess", action="store_true", help="Strip boilerplate and identifiers locally before the LLM call")
+    parser.add_argument("--gazetteer", default=GAZETTEER_FILE, help="Company names to scrub when preprocessing")
+    parser.add_argument("--chunked", action="store_true", help="Map-reduce very long CVs over parallel chunk calls")
+    parser.add_argument("--long-cv-chars", type=int, default=LONG_CV_CHARS, help="CV length that triggers chunking")
+    parser.add_argument("--no-validate", action="store_true", help="Pass model output through without schema checks")
+    parser.add_argument("--repair-attempts", type=int, default=REPAIR_ATTEMPTS, help="Re-asks of the model per invalid profile")
+    parser.add_argument("--repair-queue", default=REPAIR_QUEUE_FILE, help="JSON-lines file for profiles that stay invalid")
+
+
+def build_backend(args) -> tuple:
+    """
+    Builds the backend stack from parsed CLI args:
+    [preprocess ->] cache -> [validate ->] [chunked map-reduce ->] rate-limited retries -> Gemini/stub.
+    """
+    if args.stub:
+        backend = StubBackend(latency=args.stub_latency)
+    else:
+        try:
+            backend = GeminiBackend(load_api_key())
+        except FileNotFoundError as e:
+            raise SystemExit(f"Error: {e}")
+    backend = RetryingBackend(backend, args.rpm, args.tpm, args.max_retries, deadline_seconds=args.deadline)
+    if args.chunked:
+        # Below the cache and above the retries: one cache entry per CV, retries per chunk call
+        backend = ChunkedBackend(backend, args.long_cv_chars)
+    if not args.no_validate:
+        # Below the cache so invalid profiles are never cached and repairs reach the model
+        validator = ProfileValidator(gazetteer=load_gazetteer(args.gazetteer))
+        backend = ValidatingBackend(backend, validator, RepairQueue(args.repair_queue), args.repair_attempts)
+    cache = None
+    if not args.no_cache:
+        cache = CVCache(args.cache_dir)
+        if args.clear_cache:
+            cache.clear()
+        backend = CachedBackend(backend, cache)
+    if args.preprocess:
+        # Outermost, so the cache is keyed on the reduced text that is actually sent
+        backend = PreprocessingBackend(backend, load_gazetteer(args.gazetteer))
+    return backend, cache, DeadLetterFile(args.dead_letter)
+
+
+def print_backend_report(cache: CVCache | None, dead_letter: DeadLetterFile, backend=None):
+    if isinstance(backend, PreprocessingBackend) and backend.original_tokens:
+        saved = 1 - backend.tokens / backend.original_tokens
+        print(f"Preprocessing: {backend.original_tokens} -> {backend.tokens} prompt tokens ({saved:.0%} saved).")
+    if cache:
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), {stats['evictions']} evictions.")
+    layer = backend
+    while layer is not None:
+        if isinstance(layer, ValidatingBackend):
+            if layer.repaired:
+                print(f"🩹 {layer.repaired} invalid profiles were fixed by a repair request.")
+            if layer.repair_queue.count:
+                print(f"⚠️ {layer.repair_queue.count} profiles stayed invalid and were queued in '{layer.repair_queue.path}'.")
+        layer = getattr(layer, "backend", None)
+    if dead_letter.count:
+        print(f"⚠️ {dead_letter.count} CVs failed permanently and were written to '{dead_letter.path}'.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a batch of CVs into anonymized JSON profiles.")
+    parser.add_argument("source", help="Directory of *.txt CVs or a manifest file listing CV paths")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    add_backend_arguments(parser)
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    cv_paths = collect_cv_files(args.source)
+    backend, cache, dead_letter = build_backend(args)
+
+    print(f"--- 📚 Batch CV Parser ({len(cv_paths)} CVs, concurrency {args.concurrency}, model {backend.model_name}) ---")
+    start = time.perf_counter()
+    with instrumented_run(args, "cv_batch"):
+        results = run_batch(backend, cv_paths, args.output_dir, args.concurrency, dead_letter)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r.error]
+    print("\n" + "="*50)
+    print(f"Processed {len(results)} CVs in {elapsed:.2f}s ({len(results) / elapsed if elapsed else 0:.1f} CVs/s), {len(failed)} failed.")
+    print_backend_report(cache, dead_letter, backend)
+    print(f"Outputs written to '{args.output_dir}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from telemetry import count
+
+# --- CONFIGURATION ---
+CACHE_DIR = ".cv_cache"
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512 MB
+MAX_CACHE_AGE_SECONDS = 30 * 24 * 3600  # 30 days
+
+
+def config_fingerprint(model_name: str, config) -> dict:
+    """Everything besides the CV text that changes what the model returns."""
+    schema = config.response_schema
+    return {
+        "model": model_name,
+        "system_prompt": config.system_instruction,
+        "schema": schema.model_dump(mode="json", exclude_none=True) if schema is not None else None,
+        "temperature": config.temperature,
+    }
+
+
+def cache_key(cv_text: str, model_name: str, config) -> str:
+    """Content address of one parse request: sha256 over the CV text and the request fingerprint."""
+    payload = json.dumps({"cv": cv_text, **config_fingerprint(model_name, config)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CVCache:
+    """
+    On-disk cache of parsed CV JSON, one file per key.
+
+    Entries written more than `max_age_seconds` ago are treated as misses and
+    removed, however often they are read. When the total size passes `max_bytes`
+    the least recently used entries are evicted. An entry's mtime is its write
+    time and its atime its last hit (set explicitly, so noatime mounts don't matter).
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES,
+                 max_age_seconds: float = MAX_CACHE_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.max_age_seconds:
+                self._remove(path, stat.st_size)
+                raise FileNotFoundError(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict):
+        path = self._path(key)
+        data = json.dumps(value, indent=4).encode("utf-8")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        try:
+            old_size = os.stat(path).st_size
+        except FileNotFoundError:
+            old_size = 0
+        # Atomic rename so concurrent readers never see a half-written entry
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += len(data) - old_size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _remove(self, path: str, size: int):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._size -= size
+            self.evictions += 1
+
+    def evict(self):
+        """Drops expired entries, then the oldest ones until the cache is back under 90% of max_bytes."""
+        now = time.time()
+        entries = []
+        for entry in self._entries():
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age_seconds:
+                self._remove(entry.path, stat.st_size)
+            else:
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+
+        # Evict a little below the limit so every put doesn't trigger a full scan
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if self._size <= target:
+                break
+            self._remove(path, size)
+
+    def clear(self):
+        """Invalidates every cached entry."""
+        for entry in self._entries():
+            self._remove(entry.path, entry.stat().st_size)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+        }
+
+
+class CachedBackend:
+    """Wraps a backend (see cv_batch) and serves repeat CVs from a CVCache instead of calling the model."""
+
+    def __init__(self, backend, cache: CVCache):
+        self.backend = backend
+        self.cache = cache
+        self.model_name = backend.model_name
+        self.system_prompt, self.config = backend.system_prompt, backend.config
+
+    def parse(self, cv_text: str) -> dict:
+        key = cache_key(cv_text, self.model_name, self.config)
+        cached = self.cache.get(key)
+        count("cv_cache_lookups_total", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+        json_output = self.backend.parse(cv_text)
+        self.cache.put(key, json_output)
+        return json_output
@@ -0,0 +1,154 @@
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from cv_to_json import create_chunk_payload_config
+from cv_preprocess import DATE_RANGE, segment
+from telemetry import count
+from tokens import normalize_tokens
+
+# --- CONFIGURATION ---
+LONG_CV_CHARS = 20000  # ~5k tokens; shorter CVs still go out in one call
+CHUNK_CHARS = 8000
+CHUNK_WORKERS = 4
+MIN_ROLES = 3  # fewer roles across all chunks falls back to one whole-CV call
+MAX_ROLES = 4
+MAX_ACHIEVEMENTS = 3
+MAX_STRENGTHS = 4
+
+SCALAR_FIELDS = ["title", "gender", "experience_summary", "sector_focus", "location"]
+
+_QUANTIFIED = re.compile(r"\d")
+
+
+def _split_long_block(lines: list[str], max_chars: int) -> list[list[str]]:
+    """Splits an oversized section, preferring role boundaries (dated lines) over arbitrary lines."""
+    pieces, current, size = [], [], 0
+    for line in lines:
+        at_role_start = bool(DATE_RANGE.search(line))
+        if current and (size + len(line) > max_chars or (at_role_start and size > max_chars // 2)):
+            pieces.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_cv(cv_text: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """
+    Cuts a CV into chunks of at most ~max_chars, packing whole sections together
+    and only splitting a section (at role boundaries where possible) when it is too long on its own.
+    """
+    blocks = []
+    for heading, _, body in segment(cv_text.splitlines()):
+        lines = ([] if heading == "header" else [heading + ":"]) + body
+        if sum(len(line) + 1 for line in lines) > max_chars:
+            blocks.extend(_split_long_block(lines, max_chars))
+        elif lines:
+            blocks.append(lines)
+
+    chunks, current, size = [], [], 0
+    for block in blocks:
+        block_size = sum(len(line) + 1 for line in block)
+        if current and size + block_size > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.extend(block)
+        size += block_size
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _role_key(role: dict) -> tuple:
+    return (tuple(normalize_tokens(role.get("job_title"))), tuple(normalize_tokens(role.get("description"))))
+
+
+def merge_profiles(partials: list[dict]) -> dict:
+    """
+    Local reduce step: folds per-chunk profiles (in CV order) into one profile
+    that fits the response schema.
+
+    - scalar fields: from the first chunk that has them (the header chunk, the
+      only one asked for them)
+    - experience: duplicates dropped; the first (most recent) role plus the
+      roles with the most quantified achievements, up to MAX_ROLES, kept in CV
+      order; each role keeps up to MAX_ACHIEVEMENTS achievements, quantified ones first
+    - core_strengths: the MAX_STRENGTHS mentioned in the most chunks
+    """
+    merged = {name: next((p[name] for p in partials if p.get(name)), "") for name in SCALAR_FIELDS}
+
+    roles, seen = [], set()
+    for partial in partials:
+        for role in partial.get("experience", []):
+            key = _role_key(role)
+            if key not in seen:
+                seen.add(key)
+                roles.append(role)
+
+    def quantified(text: str) -> bool:
+        return bool(_QUANTIFIED.search(text))
+
+    def rank(i):
+        return (i != 0, -sum(map(quantified, roles[i].get("achievements", []))), i)
+
+    merged["experience"] = []
+    for i in sorted(sorted(range(len(roles)), key=rank)[:MAX_ROLES]):
+        achievements = sorted(roles[i].get("achievements", []), key=lambda a: not quantified(a))
+        merged["experience"].append(dict(roles[i], achievements=achievements[:MAX_ACHIEVEMENTS]))
+
+    strengths, first_seen = Counter(), {}
+    for partial in partials:
+        for strength in partial.get("core_strengths", []):
+            key = " ".join(normalize_tokens(strength))
+            strengths[key] += 1
+            first_seen.setdefault(key, strength)
+    merged["core_strengths"] = [first_seen[key] for key, _ in strengths.most_common(MAX_STRENGTHS)]
+    return merged
+
+
+class ChunkedBackend:
+    """
+    Wraps a backend (see cv_batch) with a map-reduce path for very long CVs:
+    the chunks are parsed in parallel, then merged locally with merge_profiles.
+
+    The first chunk is asked for the candidate-level fields plus its roles and
+    strengths, the others only for their roles and strengths, with no minimum
+    counts (see create_chunk_payload_config). If the chunks hold fewer than
+    MIN_ROLES roles in total, the CV is parsed again in one call.
+    CVs under `long_cv_chars` are passed straight through.
+    """
+
+    def __init__(self, backend, long_cv_chars: int = LONG_CV_CHARS, chunk_chars: int = CHUNK_CHARS,
+                 workers: int = CHUNK_WORKERS):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt, self.config = backend.system_prompt, backend.config
+        self.header_config = create_chunk_payload_config(header=True)[1]
+        self.chunk_config = create_chunk_payload_config()[1]
+        self.long_cv_chars = long_cv_chars
+        self.chunk_chars = chunk_chars
+        self.workers = workers
+
+    def parse_unchunked(self, cv_text: str) -> dict:
+        """One call with the full schema, whatever the length (used for repair prompts)."""
+        return self.backend.parse(cv_text)
+
+    def parse(self, cv_text: str) -> dict:
+        if len(cv_text) <= self.long_cv_chars:
+            return self.backend.parse(cv_text)
+        chunks = split_cv(cv_text, self.chunk_chars)
+        if len(chunks) == 1:
+            return self.backend.parse(cv_text)
+        # Tell the model it only sees part of the CV, so it doesn't pad missing roles
+        parts = [f"[Part {i} of {len(chunks)} of a longer CV]\n{chunk}" for i, chunk in enumerate(chunks, start=1)]
+        configs = [self.header_config] + [self.chunk_config] * (len(parts) - 1)
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(parts))) as pool:
+            partials = list(pool.map(lambda part, config: self.backend.parse(part, config=config), parts, configs))
+        merged = merge_profiles(partials)
+        if len(merged["experience"]) < MIN_ROLES:
+            count("cv_chunk_fallbacks_total")
+            return self.backend.parse(cv_text)
+        return merged
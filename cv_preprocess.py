@@ -0,0 +1,244 @@
+import os
+import re
+import argparse
+import datetime
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from tokens import estimate_tokens
+
+# --- CONFIGURATION ---
+GAZETTEER_FILE = "company_gazetteer.txt"  # optional: one company / organisation name per line
+MAX_ROLES = 6  # the schema keeps 3-4 roles; a little headroom lets the model choose
+
+# Sections that never feed the response schema
+DROP_SECTIONS = ("references", "referees", "hobbies", "interests", "education", "languages", "declaration")
+# Sections where contact lines are removed but the rest (often a skills column) is kept
+CONTACT_SECTIONS = ("personal data", "personal details", "personal information", "contact")
+EXPERIENCE_SECTIONS = ("professional experience", "experience", "work experience", "employment", "career")
+KNOWN_SECTIONS = DROP_SECTIONS + CONTACT_SECTIONS + EXPERIENCE_SECTIONS + (
+    "summary", "profile", "key projects", "skills", "certifications", "achievements",
+)
+
+BOILERPLATE_LINES = {"curriculum vitae", "resume", "cv"}
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?<![\w.])\+?\d[\d .()/-]{7,}\d(?![\w.])")
+URL = re.compile(r"\b(?:https?://|www\.)\S+|\blinkedin\.com/\S+", re.IGNORECASE)
+ADDRESS = re.compile(r"\b(?:street|str\.|avenue|ave\.|road|calea|bulevardul|blvd\.?|district|sector \d|no\.?|nr\.?|apt\.?|zip|postal)(?=\W|$)",
+                     re.IGNORECASE)
+PAGE_NUMBER = re.compile(r"^\d{1,3}$")
+HEADING = re.compile(r"^([A-Za-z][A-Za-z &/]{1,40}):?$")
+LEGAL_ENTITY = re.compile(
+    r"\b(?:[A-Z][\w&'-]*[ \t]+){1,5}(?:S\.A\.?|SA|S\.R\.L\.|SRL|IFN|GmbH|AG|Ltd\.?|LLC|Inc\.?|PLC|N\.V\.|B\.V\.|SpA)(?=\W|$)"
+)
+
+_MONTHS = "jan feb mar apr may jun jul aug sep oct nov dec".split()
+
+
+def _date(tag: str) -> str:
+    return (rf"(?:(?P<{tag}m>\d{{1,2}})[./]|(?P<{tag}mn>{'|'.join(_MONTHS)})[a-z]*\.?\s+)?"
+            rf"(?P<{tag}y>(?:19|20)\d{{2}})")
+
+
+DATE_RANGE = re.compile(rf"{_date('a')}\s*[-–—]\s*(?:{_date('b')}|(?P<open>present|current|now|today))", re.IGNORECASE)
+
+
+@dataclass
+class PreprocessResult:
+    text: str
+    original_tokens: int
+    tokens: int
+    dropped_sections: list[str] = field(default_factory=list)
+    replacements: Counter = field(default_factory=Counter)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+    @property
+    def savings(self) -> float:
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+
+def _months(match: re.Match, tag: str) -> int:
+    year = match.group(f"{tag}y")
+    month = match.group(f"{tag}m")
+    name = match.group(f"{tag}mn")
+    month = int(month) if month else (_MONTHS.index(name.lower()[:3]) + 1 if name else 1)
+    return int(year) * 12 + month
+
+
+def _tenure(match: re.Match, today_year: int) -> str:
+    """'10.2024 – 11.2025' -> '[~1 year]': keeps the tenure the schema asks for, drops the exact dates."""
+    start = _months(match, "a")
+    end = today_year * 12 + 12 if match.group("open") else _months(match, "b")
+    months = max(0, end - start)
+    if months < 12:
+        return "[<1 year]"
+    years = round(months / 12)
+    return f"[~{years} year{'s' if years != 1 else ''}]"
+
+
+def load_gazetteer(path: str = GAZETTEER_FILE) -> re.Pattern | None:
+    """One compiled, case-insensitive alternation of every name in the gazetteer (longest first)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        names = sorted({line.strip() for line in f if line.strip() and not line.startswith("#")}, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(name) for name in names) + r")(?!\w)", re.IGNORECASE)
+
+
+def _section_kind(heading: str) -> str | None:
+    name = heading.lower().rstrip(":").strip()
+    for kinds, kind in ((DROP_SECTIONS, "drop"), (CONTACT_SECTIONS, "contact"), (EXPERIENCE_SECTIONS, "experience")):
+        if any(name.startswith(k) for k in kinds):
+            return kind
+    return "keep" if any(name.startswith(k) for k in KNOWN_SECTIONS) else None
+
+
+def segment(lines: list[str]) -> list[tuple[str, str, list[str]]]:
+    """Splits CV lines into (heading, kind, body lines) sections; text before the first heading is 'header'."""
+    sections = [("header", "keep", [])]
+    for line in lines:
+        stripped = line.strip()
+        match = HEADING.match(stripped)
+        kind = _section_kind(match.group(1)) if match else None
+        # A bare word is only a heading if it is a known section name or ends with a colon
+        if match and (kind or stripped.endswith(":")):
+            sections.append((stripped.rstrip(":"), kind or "keep", []))
+        else:
+            sections[-1][2].append(line)
+    return sections
+
+
+def _trim_roles(lines: list[str], max_roles: int) -> tuple[list[str], int]:
+    """Keeps the first `max_roles` dated roles of an experience section (CVs list the newest first)."""
+    starts = []
+    for i, line in enumerate(lines):
+        if DATE_RANGE.search(line):
+            # A short undated line right above the dates is the company header of the same role
+            start = i - 1 if i > 0 and len(lines[i - 1]) < 80 and not DATE_RANGE.search(lines[i - 1]) else i
+            if not starts or start > starts[-1]:
+                starts.append(start)
+    if len(starts) <= max_roles:
+        return lines, 0
+    return lines[:starts[max_roles]], len(starts) - max_roles
+
+
+def preprocess_cv(cv_text: str, gazetteer: re.Pattern | None = None, max_roles: int = MAX_ROLES,
+                  today_year: int | None = None) -> PreprocessResult:
+    """
+    Shrinks a raw CV before it is sent to the model.
+
+    Drops boilerplate (repeated page headers, page numbers, 'Curriculum Vitae'),
+    sections the schema never uses, contact lines and roles beyond `max_roles`;
+    then replaces emails, phones, URLs, company names and date ranges with
+    placeholders (date ranges become approximate tenure).
+    """
+    today_year = today_year or datetime.date.today().year
+    result = PreprocessResult(text="", original_tokens=estimate_tokens(cv_text), tokens=0)
+    counts = result.replacements
+
+    lines = [line.rstrip() for line in cv_text.splitlines()]
+    # Short all-caps lines repeated on every page are running headers (usually the candidate's name)
+    repeated = {line for line, n in Counter(l.strip() for l in lines).items()
+                if n > 1 and line.isupper() and len(line.split()) <= 5}
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped in repeated or PAGE_NUMBER.match(stripped) or stripped.lower() in BOILERPLATE_LINES:
+            counts["boilerplate_lines"] += bool(stripped)
+            continue
+        kept.append(line)
+
+    output = []
+    for heading, kind, body in segment(kept):
+        if kind == "drop":
+            result.dropped_sections.append(heading)
+            continue
+        if kind == "contact":
+            before = len(body)
+            body = [line for line in body if not (EMAIL.search(line) or PHONE.search(line) or ADDRESS.search(line))]
+            counts["contact_lines"] += before - len(body)
+        if kind == "experience":
+            body, dropped_roles = _trim_roles(body, max_roles)
+            counts["old_roles"] += dropped_roles
+        if heading != "header":
+            output.append(heading + ":")
+        output.extend(body)
+
+    text = "\n".join(output)
+    # Date ranges first, otherwise '05.2018 - 12.2021' reads like a phone number
+    text, n = DATE_RANGE.subn(lambda m: _tenure(m, today_year), text)
+    counts["date_ranges"] += n
+    for name, pattern, placeholder in (("emails", EMAIL, "[EMAIL]"), ("urls", URL, "[URL]"), ("phones", PHONE, "[PHONE]")):
+        text, n = pattern.subn(placeholder, text)
+        counts[name] += n
+    # Whole legal names ('SALT BANK S.A.') before gazetteer fragments of them ('SALT')
+    text, n = LEGAL_ENTITY.subn("[COMPANY]", text)
+    counts["companies"] += n
+    if gazetteer is not None:
+        text, n = gazetteer.subn("[COMPANY]", text)
+        counts["companies"] += n
+
+    result.text = text
+    result.tokens = estimate_tokens(text)
+    return result
+
+
+class PreprocessingBackend:
+    """Wraps a backend (see cv_batch) so every CV is preprocessed before it is parsed (or looked up in the cache)."""
+
+    def __init__(self, backend, gazetteer: re.Pattern | None = None, max_roles: int = MAX_ROLES):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt, self.config = backend.system_prompt, backend.config
+        self.gazetteer = gazetteer
+        self.max_roles = max_roles
+        self.original_tokens = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def parse(self, cv_text: str) -> dict:
+        result = preprocess_cv(cv_text, self.gazetteer, self.max_roles)
+        with self._lock:
+            self.original_tokens += result.original_tokens
+            self.tokens += result.tokens
+        print(f"✂️ Prompt shrunk {result.original_tokens} -> {result.tokens} tokens ({result.savings:.0%} saved)")
+        return self.backend.parse(result.text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview the local CV pre-extraction and its token savings.")
+    parser.add_argument("paths", nargs="+", help="CV text files")
+    parser.add_argument("--gazetteer", default=GAZETTEER_FILE)
+    parser.add_argument("--max-roles", type=int, default=MAX_ROLES)
+    parser.add_argument("--show", action="store_true", help="Print the reduced text")
+    args = parser.parse_args()
+
+    gazetteer = load_gazetteer(args.gazetteer)
+    total_before = total_after = 0
+    for path in args.paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            result = preprocess_cv(f.read(), gazetteer, args.max_roles)
+        total_before += result.original_tokens
+        total_after += result.tokens
+        replaced = ", ".join(f"{n} {name}" for name, n in result.replacements.items() if n)
+        print(f"📄 {path}: {result.original_tokens} -> {result.tokens} tokens ({result.savings:.0%} saved)")
+        if result.dropped_sections:
+            print(f"   dropped sections: {', '.join(result.dropped_sections)}")
+        if replaced:
+            print(f"   removed/replaced: {replaced}")
+        if args.show:
+            print("\n" + result.text + "\n")
+
+    if len(args.paths) > 1 and total_before:
+        print(f"\nTotal: {total_before} -> {total_after} tokens ({1 - total_after / total_before:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,28 @@
 import os
 import json
-from google import genai
-from google.genai import types
+import argparse
+from typing import TYPE_CHECKING
+
+from telemetry import add_telemetry_arguments, count, instrumented_run, span, traced
+
+# google.genai is imported inside the functions that need it, so importing this
+# module (e.g. for the schema or MODEL_NAME) stays cheap
+if TYPE_CHECKING:
+    from google.genai import types
 
 # --- CONFIGURATION ---
 CV_FILE_PATH = "cv_text.txt"
-# API_KEY = "write_your_api_key_here" # REPLACE THIS with your actual Gemini API Key
-try:
-    with open("api_key.txt", "r") as f:
-        API_KEY = f.read().strip() # .strip() removes invisible newlines or spaces
-except FileNotFoundError:
-    print("Error: 'api_key.txt' file not found. Please create it and paste your key inside.")
-    exit()
+API_KEY_FILE = "api_key.txt"  # paste your Gemini API key in here
 MODEL_NAME = "gemini-2.5-flash"
 
+def load_api_key(path: str = API_KEY_FILE) -> str:
+    """Reads the Gemini API key; raises FileNotFoundError with a hint when the file is missing."""
+    try:
+        with open(path, "r") as f:
+            return f.read().strip() # .strip() removes invisible newlines or spaces
+    except FileNotFoundError:
+        raise FileNotFoundError(f"'{path}' file not found. Please create it and paste your key inside.") from None
+
 def read_cv_file(file_path: str) -> str:
     """Reads the CV text from a file."""
     try:
@@ -24,44 +33,52 @@ def read_cv_file(file_path: str) -> str:
         print("Please create the file and paste the CV content into it.")
         exit(1)
 
-def create_gemini_payload_config() -> tuple[str, types.GenerateContentConfig]:
+def _profile_properties() -> dict:
+    """The response schema's fields, shared by the full-CV and the chunk configs."""
+    from google.genai import types
+
+    return {
+        "title": types.Schema(type=types.Type.STRING, description="The highest-level functional title or primary role of the candidate (e.g., Fractional CFO | Strategic Financial Leader)."),
+        "gender": types.Schema(type=types.Type.STRING, description="The candidate's gender."),
+        "experience_summary": types.Schema(type=types.Type.STRING, description="A generalized summary of the candidate's total experience, focusing on tenure and type of firm (e.g., 20+ years, Global consulting firm background). Must NOT include specific company names or brand names like 'Big4'. Must be of maximum 10 words"),
+        "sector_focus": types.Schema(type=types.Type.STRING, description="The primary industry sectors the candidate focuses on."),
+        "location": types.Schema(type=types.Type.STRING, description="The candidate's general geographic region and availability (e.g., North America (Remote/Hybrid)). Must NOT include city names, but can include country names."),
+        "experience": types.Schema(
+            type=types.Type.ARRAY,
+            description="A list of key roles and professional achievements. Must find minimum 3 or maximum 4 in total",
+            items=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "job_title": types.Schema(type=types.Type.STRING, description="The functional title of the role or section. Must NOT include company name or specific dates."),
+                    "description": types.Schema(type=types.Type.STRING, description="The generalized context of the role (e.g., Executive at a Leading Technology Group, Board Member at a Private Equity Fund). Must NOT include the company's specific name. Must use attractive, MVP terms"),
+                    "achievements": types.Schema(
+                        type=types.Type.ARRAY,
+                        description="A list of quantified and critical achievements for this role. Ensure quantifiable metrics remain but unique project names are generalized. Must find atleast 2 or maximum 3 in total.",
+                        items=types.Schema(type=types.Type.STRING)
+                    )
+                },
+                required=["job_title", "description", "achievements"]
+            )
+        ),
+        "core_strengths": types.Schema(
+            type=types.Type.ARRAY,
+            description="A list of minimum 3, maximum 4 high-level core competencies or skills.",
+            items=types.Schema(type=types.Type.STRING)
+        )
+    }
+
+
+def create_gemini_payload_config() -> tuple[str, "types.GenerateContentConfig"]:
     """
     Creates the system prompt and configuration object for the Gemini API call 
     to perform structured CV parsing with strict anonymization.
     """
+    from google.genai import types
     
     # 1. Define the desired output structure (JSON Schema)
     response_schema = types.Schema(
         type=types.Type.OBJECT,
-        properties={
-            "title": types.Schema(type=types.Type.STRING, description="The highest-level functional title or primary role of the candidate (e.g., Fractional CFO | Strategic Financial Leader)."),
-            "gender": types.Schema(type=types.Type.STRING, description="The candidate's gender."),
-            "experience_summary": types.Schema(type=types.Type.STRING, description="A generalized summary of the candidate's total experience, focusing on tenure and type of firm (e.g., 20+ years, Global consulting firm background). Must NOT include specific company names or brand names like 'Big4'. Must be of maximum 10 words"),
-            "sector_focus": types.Schema(type=types.Type.STRING, description="The primary industry sectors the candidate focuses on."),
-            "location": types.Schema(type=types.Type.STRING, description="The candidate's general geographic region and availability (e.g., North America (Remote/Hybrid)). Must NOT include city names, but can include country names."),
-            "experience": types.Schema(
-                type=types.Type.ARRAY,
-                description="A list of key roles and professional achievements. Must find minimum 3 or maximum 4 in total",
-                items=types.Schema(
-                    type=types.Type.OBJECT,
-                    properties={
-                        "job_title": types.Schema(type=types.Type.STRING, description="The functional title of the role or section. Must NOT include company name or specific dates."),
-                        "description": types.Schema(type=types.Type.STRING, description="The generalized context of the role (e.g., Executive at a Leading Technology Group, Board Member at a Private Equity Fund). Must NOT include the company's specific name. Must use attractive, MVP terms"),
-                        "achievements": types.Schema(
-                            type=types.Type.ARRAY,
-                            description="A list of quantified and critical achievements for this role. Ensure quantifiable metrics remain but unique project names are generalized. Must find atleast 2 or maximum 3 in total.",
-                            items=types.Schema(type=types.Type.STRING)
-                        )
-                    },
-                    required=["job_title", "description", "achievements"]
-                )
-            ),
-            "core_strengths": types.Schema(
-                type=types.Type.ARRAY,
-                description="A list of minimum 3, maximum 4 high-level core competencies or skills.",
-                items=types.Schema(type=types.Type.STRING)
-            )
-        },
+        properties=_profile_properties(),
         required=["title", "gender", "experience_summary", "sector_focus", "location", "experience", "core_strengths"]
     )
 
@@ -86,6 +103,63 @@ def create_gemini_payload_config() -> tuple[str, types.GenerateContentConfig]:
 
     return system_prompt, config
 
+def create_chunk_payload_config(header: bool = False) -> tuple[str, "types.GenerateContentConfig"]:
+    """
+    System prompt and configuration for one part of a very long CV (see cv_chunked).
+
+    A part only holds some of the roles, so the schema asks for the roles, achievements and
+    strengths found in it, with no minimum counts that would make the model pad them.
+    Only the `header` part (the start of the CV) also carries the candidate-level fields.
+    """
+    from google.genai import types
+
+    full_prompt, full_config = create_gemini_payload_config()
+    properties = _profile_properties()
+    role = properties["experience"].items
+    achievements = role.properties["achievements"].model_copy(update={"description": "The quantified and critical achievements stated for this role. Ensure quantifiable metrics remain but unique project names are generalized."})
+    properties["experience"] = properties["experience"].model_copy(update={
+        "description": "Every role described in this part of the CV, with its achievements. Only roles that appear in this part; the list may be empty.",
+        "items": role.model_copy(update={"properties": dict(role.properties, achievements=achievements)}),
+    })
+    properties["core_strengths"] = properties["core_strengths"].model_copy(update={"description": "The high-level core competencies or skills evidenced in this part of the CV."})
+    fields = (["title", "gender", "experience_summary", "sector_focus", "location"] if header else []) + ["experience", "core_strengths"]
+
+    system_prompt = full_prompt + (
+        " You are given ONE PART of a longer CV. Extract only what this part states; "
+        "never invent roles, achievements or candidate details to fill the schema."
+    )
+    config = full_config.model_copy(update={
+        "system_instruction": system_prompt,
+        "response_schema": types.Schema(type=types.Type.OBJECT, properties={name: properties[name] for name in fields}, required=fields),
+    })
+    return system_prompt, config
+
+def parse_cv_text(client, config: "types.GenerateContentConfig", cv_text: str, model_name: str = MODEL_NAME,
+                  timeout: float | None = None) -> dict:
+    """
+    Sends one CV to the model with a prebuilt client/config and returns the parsed JSON.
+
+    `timeout` (seconds) bounds the HTTP request; google-genai waits forever by default.
+    """
+    if timeout is not None:
+        from google.genai import types
+        config = config.model_copy(update={"http_options": types.HttpOptions(timeout=max(1, int(timeout * 1000)))})
+    with span("gemini.generate_content", model=model_name) as s:
+        response = client.models.generate_content(
+            model=model_name,
+            contents=[cv_text],
+            config=config
+        )
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            s.set(prompt_tokens=usage.prompt_token_count, output_tokens=usage.candidates_token_count)
+            count("gemini_tokens_total", usage.prompt_token_count or 0, model=model_name, kind="prompt")
+            count("gemini_tokens_total", usage.candidates_token_count or 0, model=model_name, kind="output")
+        count("gemini_requests_total", model=model_name)
+    # The response text will be a JSON string due to the config
+    return json.loads(response.text)
+
+@traced("call_gemini_api")
 def call_gemini_api(cv_text: str, api_key: str):
     """Initializes the client and calls the Gemini API."""
     print("--- 🤖 Gemini API Call ---")
@@ -95,6 +169,8 @@ def call_gemini_api(cv_text: str, api_key: str):
         print("Cannot proceed with API call.")
         return
 
+    from google import genai
+
     # Initialize the client with the provided API Key
     client = genai.Client(api_key=api_key)
     
@@ -107,17 +183,11 @@ def call_gemini_api(cv_text: str, api_key: str):
 
     try:
         # Call the API
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=[cv_text],
-            config=config
-        )
+        json_output = parse_cv_text(client, config, cv_text)
 
         print("\n--- ✅ Anonymized and Structured JSON Output from Gemini ---")
         
-        # The response text will be a JSON string due to the config
-        # We parse it and print it with indentation for readability
-        json_output = json.loads(response.text)
+        # We print it with indentation for readability
         output_path = "json_output.json"
         with open(output_path, 'w') as f:
             f.write(json.dumps(json_output, indent=4))
@@ -125,12 +195,17 @@ def call_gemini_api(cv_text: str, api_key: str):
         # print(json.dumps(json_output, indent=4))
         
     except Exception as e:
+        count("gemini_failures_total", reason=type(e).__name__)
         print(f"\n--- ❌ ERROR DURING API CALL ---")
         print(f"An error occurred: {e}")
         print("Please check your API key, network connection, and ensure the SDK is installed.")
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Parse one CV into an anonymized JSON profile.")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
     print(f"--- 📄 CV Parser and Anonymizer ---")
     
     # 1. Read CV from file
@@ -138,8 +213,18 @@ if __name__ == "__main__":
     print(f"Successfully read CV content from '{CV_FILE_PATH}'.\n")
     
     # 2. Call the Gemini API
-    call_gemini_api(cv_text, API_KEY)
+    try:
+        api_key = load_api_key()
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        exit()
+    with instrumented_run(args, "cv_to_json"):
+        call_gemini_api(cv_text, api_key)
     
     print("\n" + "="*50)
     print("Process Complete. The output is the structured, anonymized CV profile.")
+
+
+if __name__ == "__main__":
+    main()
     # Would you like me to run the regex-based parsing to compare the outputs?
\ No newline at end of file
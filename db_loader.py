@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import sqlite3
+import argparse
+
+from json_to_sql import executive_row, highlight_rows, strength_rows
+from profile_store import ProfileStore, is_store
+
+# --- CONFIGURATION ---
+DATABASE_FILE = "executives.db"
+BATCH_SIZE = 1000  # profiles per transaction
+
+# The executives / executive_highlights / executive_strengths schema, in SQLite dialect
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS executives (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    gender TEXT,
+    experience TEXT,
+    sector_focus TEXT,
+    location TEXT,
+    source_key TEXT,  -- natural key for idempotent re-ingest (see sql_ingest.py)
+    content_hash TEXT
+);
+
+CREATE TABLE IF NOT EXISTS executive_highlights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    executive_id INTEGER NOT NULL REFERENCES executives(id),
+    position_title TEXT,
+    company_description TEXT,
+    details TEXT,
+    display_order INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS executive_strengths (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    executive_id INTEGER NOT NULL REFERENCES executives(id),
+    strength_description TEXT,
+    display_order INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_highlights_executive ON executive_highlights(executive_id);
+CREATE INDEX IF NOT EXISTS idx_strengths_executive ON executive_strengths(executive_id);
+"""
+
+
+def create_schema(conn: sqlite3.Connection):
+    conn.executescript(SCHEMA_SQL)
+
+
+def insert_sql(placeholder: str = "?", returning: bool = False) -> tuple[str, str, str]:
+    """
+    The three parameterized INSERTs, for any DB-API driver.
+
+    `placeholder` is the driver's parameter marker ('?' for sqlite3, '%s' for
+    psycopg/MySQL drivers). With `returning` the executives insert hands back
+    the new id itself, for drivers whose cursor has no usable lastrowid.
+    """
+    p = placeholder
+    executives = f"INSERT INTO executives (title, gender, experience, sector_focus, location) VALUES ({p}, {p}, {p}, {p}, {p})"
+    if returning:
+        executives += " RETURNING id"
+    highlights = ("INSERT INTO executive_highlights (executive_id, position_title, company_description, details, display_order) "
+                  f"VALUES ({p}, {p}, {p}, {p}, {p})")
+    strengths = f"INSERT INTO executive_strengths (executive_id, strength_description, display_order) VALUES ({p}, {p}, {p})"
+    return executives, highlights, strengths
+
+
+def load_batch(conn, profiles: list[dict], placeholder: str = "?", returning: bool = False) -> list[int]:
+    """
+    Inserts one batch of profiles in a single transaction and returns their new executive ids.
+
+    The executives rows go in one by one to get each id back; the highlight and
+    strength rows for the whole batch then go in with one executemany per table.
+    Any error rolls the whole batch back.
+    """
+    executives_sql, highlights_sql, strengths_sql = insert_sql(placeholder, returning)
+    cursor = conn.cursor()
+    ids, highlights, strengths = [], [], []
+    try:
+        for data in profiles:
+            cursor.execute(executives_sql, executive_row(data))
+            executive_id = cursor.fetchone()[0] if returning else cursor.lastrowid
+            ids.append(executive_id)
+            highlights.extend(highlight_rows(data, executive_id))
+            strengths.extend(strength_rows(data, executive_id))
+        cursor.executemany(highlights_sql, highlights)
+        cursor.executemany(strengths_sql, strengths)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return ids
+
+
+def load_profiles(conn, profiles, batch_size: int = BATCH_SIZE, placeholder: str = "?",
+                  returning: bool = False) -> list[int]:
+    """Loads any iterable of profiles, `batch_size` per transaction; returns all new executive ids."""
+    ids, batch = [], []
+    for data in profiles:
+        batch.append(data)
+        if len(batch) >= batch_size:
+            ids.extend(load_batch(conn, batch, placeholder, returning))
+            batch = []
+    if batch:
+        ids.extend(load_batch(conn, batch, placeholder, returning))
+    return ids
+
+
+def iter_profiles(source: str):
+    """Yields profile dicts from a profile store, a JSON file (one profile or a list) or a directory of them."""
+    if is_store(source):
+        with ProfileStore(source) as store:
+            yield from store
+        return
+    paths = ([os.path.join(source, name) for name in sorted(os.listdir(source)) if name.endswith(".json")]
+             if os.path.isdir(source) else [source])
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load profile JSON straight into the executives database.")
+    parser.add_argument("source", help="A profile JSON file (object or list), a directory of them or a profile store")
+    parser.add_argument("--database", default=DATABASE_FILE, help="SQLite database file")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    create_schema(conn)
+    start = time.perf_counter()
+    ids = load_profiles(conn, iter_profiles(args.source), args.batch_size)
+    elapsed = time.perf_counter() - start
+    conn.close()
+
+    print(f"--- 🗄️ Loaded {len(ids)} profiles into '{args.database}' in {elapsed:.2f}s "
+          f"({len(ids) / elapsed if elapsed else 0:.0f} profiles/s) ---")
+    if ids:
+        print(f"Executive ids {ids[0]}..{ids[-1]}")
+
+
+if __name__ == "__main__":
+    main()
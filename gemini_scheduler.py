@@ -0,0 +1,170 @@
+import json
+import time
+import random
+import threading
+
+from telemetry import count
+from tokens import estimate_tokens
+
+# --- CONFIGURATION ---
+REQUESTS_PER_MINUTE = 1000
+TOKENS_PER_MINUTE = 1_000_000
+BURST_FRACTION = 0.1  # share of the per-minute quota that may be spent back-to-back
+EXPECTED_OUTPUT_TOKENS = 800  # a parsed profile is roughly this size
+MAX_RETRIES = 6
+BASE_DELAY_SECONDS = 1.0
+MAX_DELAY_SECONDS = 60.0
+REQUEST_DEADLINE_SECONDS = 300.0
+DEAD_LETTER_FILE = "dead_letter.jsonl"
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class RequestFailed(Exception):
+    """Raised once a request has failed permanently (non-retryable error, retries exhausted or deadline hit)."""
+
+    def __init__(self, message: str, attempts: int):
+        super().__init__(f"{message} (after {attempts} attempt{'s' if attempts != 1 else ''})")
+        self.attempts = attempts
+
+
+class TokenBucket:
+    """Thread-safe token bucket: holds at most `capacity` tokens, refilled at `refill_per_second`."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0, deadline: float | None = None):
+        """
+        Blocks until `amount` tokens are available and takes them.
+
+        Requests larger than the bucket are clamped to its capacity so they can
+        still go through. Raises DeadlineExceeded if the wait would pass `deadline`
+        (a time.monotonic() value).
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.refill_per_second
+            if deadline is not None and now + wait > deadline:
+                raise DeadlineExceeded(f"rate limit wait of {wait:.1f}s would pass the request deadline")
+            time.sleep(wait)
+
+
+def quota_bucket(limit_per_minute: float, burst_fraction: float = BURST_FRACTION) -> TokenBucket:
+    """
+    A bucket that never admits more than `limit_per_minute` in any 60s window.
+
+    A window can spend a full bucket plus one minute of refill, so the refill
+    rate is what remains of the quota after the burst allowance.
+    """
+    capacity = max(1.0, limit_per_minute * burst_fraction)
+    return TokenBucket(capacity, max(limit_per_minute - capacity, 1.0) / 60.0)
+
+
+def is_transient(exc: Exception) -> bool:
+    """True for errors worth retrying: quota (429), server-side 5xx, timeouts and dropped connections."""
+    # Deferred: only reached once a request has actually failed
+    import httpx
+    from google.genai import errors
+    if isinstance(exc, errors.APIError):
+        return exc.code in TRANSIENT_STATUS_CODES
+    return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """The server's Retry-After hint, if the error carries one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryingBackend:
+    """
+    Wraps a backend (see cv_batch) with request/token rate limiting,
+    jittered exponential backoff on transient errors and a per-request deadline.
+    The wrapped backend's parse must accept a `timeout` in seconds and a per-call
+    `config` override (GeminiBackend, StubBackend).
+    """
+
+    def __init__(self, backend, requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = TOKENS_PER_MINUTE, max_retries: int = MAX_RETRIES,
+                 base_delay: float = BASE_DELAY_SECONDS, max_delay: float = MAX_DELAY_SECONDS,
+                 deadline_seconds: float = REQUEST_DEADLINE_SECONDS):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt, self.config = backend.system_prompt, backend.config
+        self.request_bucket = quota_bucket(requests_per_minute)
+        self.token_bucket = quota_bucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(max_delay, base * 2^attempt)]."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def parse(self, cv_text: str, config=None) -> dict:
+        deadline = time.monotonic() + self.deadline_seconds
+        system_prompt = config.system_instruction if config is not None else self.system_prompt
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(cv_text) + EXPECTED_OUTPUT_TOKENS
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.request_bucket.acquire(1, deadline)
+                self.token_bucket.acquire(tokens, deadline)
+                # The request itself is bounded too, or one hung call would outlive the deadline
+                return self.backend.parse(cv_text, timeout=max(0.0, deadline - time.monotonic()), config=config)
+            except DeadlineExceeded as e:
+                count("gemini_failures_total", reason="deadline")
+                raise RequestFailed(str(e), attempt) from e
+            except Exception as e:
+                if not is_transient(e):
+                    count("gemini_failures_total", reason="permanent")
+                    raise RequestFailed(f"{type(e).__name__}: {e}", attempt) from e
+                if attempt > self.max_retries:
+                    count("gemini_failures_total", reason="retries_exhausted")
+                    raise RequestFailed(f"retries exhausted, last error {type(e).__name__}: {e}", attempt) from e
+                delay = max(self.backoff_delay(attempt - 1), retry_after_seconds(e) or 0.0)
+                if time.monotonic() + delay > deadline:
+                    count("gemini_failures_total", reason="deadline")
+                    raise RequestFailed(f"deadline reached, last error {type(e).__name__}: {e}", attempt) from e
+                count("gemini_retries_total", error=type(e).__name__)
+                time.sleep(delay)
+
+
+class DeadLetterFile:
+    """Append-only JSON-lines record of CVs that failed permanently, for a later targeted rerun."""
+
+    def __init__(self, path: str = DEAD_LETTER_FILE):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, cv_path: str, error: str):
+        entry = {"cv_path": cv_path, "error": error, "failed_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.count += 1
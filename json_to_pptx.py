@@ -1,13 +1,30 @@
+import io
+import os
+import copy
 import json
+import random
+import argparse
 from pptx import Presentation
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from telemetry import add_telemetry_arguments, instrumented_run, span, traced
 
 # --- CONFIGURATION ---
 TEMPLATE_FILE = 'template.pptx'
 JSON_FILE = 'json_output.json'
 OUTPUT_FILE = 'Dora_S_Profile_Final.pptx'
+MAX_SLIDES_PER_DECK = 250  # larger batch decks are split into parts to bound memory
+
+# Every shape the renderer writes into (see fill_slide)
+TEMPLATE_SHAPE_NAMES = (
+    ['header_title', 'sidebar_gender_text', 'sidebar_sectors', 'sidebar_location', 'sidebar_summary', 'footer_strengths']
+    + [f'role_{i}' for i in range(1, 5)]
+    + ['gender_box_main', 'gender_box_1', 'gender_box_2', 'gender_box_3', 'gender_box_4']
+)
 
 # --- COLORS ---
 COLOR_PURPLE = RGBColor(137, 87, 230)
@@ -28,6 +45,30 @@ def find_in_shapes(shapes, name):
                 return found
     return None
 
+def index_shape_paths(shapes, names, prefix=()):
+    """
+    Maps each wanted name to its index path through the (grouped) shape tree.
+
+    Walks in the same order as find_in_shapes, so the first match wins just like there.
+    """
+    paths = {}
+    for i, shape in enumerate(shapes):
+        path = prefix + (i,)
+        if shape.name in names and shape.name not in paths:
+            paths[shape.name] = path
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            for name, child_path in index_shape_paths(shape.shapes, names, path).items():
+                paths.setdefault(name, child_path)
+    return paths
+
+def resolve_shape_path(slide, path):
+    """Follows an index path from index_shape_paths back to the shape on a slide."""
+    shapes = slide.shapes
+    for i in path[:-1]:
+        shapes = shapes[i].shapes
+    return shapes[path[-1]]
+
+@traced("pptx.update_shape_color")
 def update_shape_color(shape, rgb_color):
     """Colors a shape (or all children of a group)."""
     if not shape: return
@@ -47,6 +88,7 @@ def update_shape_color(shape, rgb_color):
     except AttributeError:
         pass
 
+@traced("pptx.update_simple_text")
 def update_simple_text(shape, text, font_size=Pt(12), bold=False):
     """Updates a text box with a single style."""
     if not shape: return
@@ -62,6 +104,7 @@ def update_simple_text(shape, text, font_size=Pt(12), bold=False):
     if font_size: run.font.size = font_size
     run.font.bold = bold
 
+@traced("pptx.update_labeled_text")
 def update_labeled_text(shape, label, value, font_size=Pt(14)):
     """Creates the 'Label: Value' style for the sidebar."""
     if not shape: return
@@ -84,6 +127,7 @@ def update_labeled_text(shape, label, value, font_size=Pt(14)):
     r_value.font.color.rgb = COLOR_WHITE
     r_value.font.size = font_size
 
+@traced("pptx.update_role_block")
 def update_role_block(shape, role_data):
     """Rebuilds the Role block with mixed font sizes."""
     if not shape: return
@@ -126,6 +170,7 @@ def update_role_block(shape, role_data):
         r_text.font.color.rgb = COLOR_WHITE
         r_text.font.size = Pt(14)
 
+@traced("pptx.update_footer_block")
 def update_footer_block(shape, strengths_list):
     """
     Rebuilds the Footer:
@@ -181,57 +226,230 @@ def update_footer_block(shape, strengths_list):
             r_txt2.font.size = Pt(14)
 
 
-def main():
-    print(f"Loading {TEMPLATE_FILE}...")
-    try:
-        with open(JSON_FILE, 'r') as f:
-            data = json.load(f)
-        prs = Presentation(TEMPLATE_FILE)
-        slide = prs.slides[0]
-    except Exception as e:
-        print(f"Error loading files: {e}")
-        return
+@traced("pptx.fill_slide")
+def fill_slide(slide, data, verbose=False, find_shape=None):
+    """
+    Writes one profile into the template slide (colors, sidebar, header, roles, footer).
+
+    find_shape(name) looks up placeholders; it defaults to a recursive search of the slide.
+    """
+    log = print if verbose else (lambda *args: None)
+    find = find_shape or (lambda name: get_shape_by_name(slide, name))
 
     # --- 1. GENDER LOGIC (Colors) ---
     gender_val = data.get('gender', 'Female')
     
     if gender_val.strip().lower() == 'male':
         target_color = COLOR_BLUE
-        print("Gender is Male -> Using BLUE.")
+        log("Gender is Male -> Using BLUE.")
     else:
         target_color = COLOR_PURPLE
-        print("Gender is Female -> Using PURPLE.")
+        log("Gender is Female -> Using PURPLE.")
 
     box_names = ['gender_box_main', 'gender_box_1', 'gender_box_2', 'gender_box_3', 'gender_box_4']
     for name in box_names:
-        update_shape_color(get_shape_by_name(slide, name), target_color)
+        update_shape_color(find(name), target_color)
 
     # --- 2. TEXT UPDATES (Sidebar - Font 14) ---
-    print("Updating Sidebar...")
-    update_labeled_text(get_shape_by_name(slide, 'sidebar_gender_text'), "Gender:", gender_val, font_size=Pt(14))
-    update_labeled_text(get_shape_by_name(slide, 'sidebar_sectors'), "Sector Focus:", data.get('sector_focus'), font_size=Pt(14))
-    update_labeled_text(get_shape_by_name(slide, 'sidebar_location'), "Location:", data.get('location'), font_size=Pt(14))
+    log("Updating Sidebar...")
+    update_labeled_text(find('sidebar_gender_text'), "Gender:", gender_val, font_size=Pt(14))
+    update_labeled_text(find('sidebar_sectors'), "Sector Focus:", data.get('sector_focus'), font_size=Pt(14))
+    update_labeled_text(find('sidebar_location'), "Location:", data.get('location'), font_size=Pt(14))
     
     exp_text = data.get('experience_summary', '')
-    update_labeled_text(get_shape_by_name(slide, 'sidebar_summary'), "Experience:", exp_text, font_size=Pt(14))
+    update_labeled_text(find('sidebar_summary'), "Experience:", exp_text, font_size=Pt(14))
 
     # --- 3. TEXT UPDATES (Main Header - Font 24) ---
-    print("Updating Header...")
-    title_shape = get_shape_by_name(slide, 'header_title')
+    log("Updating Header...")
+    title_shape = find('header_title')
     update_simple_text(title_shape, data.get('title'), font_size=Pt(24), bold=True)
 
     # --- 4. TEXT UPDATES (Roles - Mixed Fonts) ---
-    print("Updating Roles...")
+    log("Updating Roles...")
     experiences = data.get('experience', [])
     for i, role_data in enumerate(experiences):
-        update_role_block(get_shape_by_name(slide, f'role_{i+1}'), role_data)
+        update_role_block(find(f'role_{i+1}'), role_data)
 
     # --- 5. TEXT UPDATES (Footer - Font 14 with Label) ---
-    print("Updating Footer...")
+    log("Updating Footer...")
     strengths = data.get('core_strengths', [])
-    update_footer_block(get_shape_by_name(slide, 'footer_strengths'), strengths)
+    update_footer_block(find('footer_strengths'), strengths)
+
+class CompiledTemplate:
+    """
+    The template parsed once and reused for any number of profiles.
+
+    Placeholder shapes are resolved through a precomputed name -> index-path
+    table instead of a recursive search per lookup. Between renders the slide's
+    shape tree is restored from a pristine copy, so nothing is re-read from disk.
+    Not thread-safe: use one instance per thread or process.
+    """
+
+    def __init__(self, template_file=TEMPLATE_FILE):
+        self.prs = Presentation(template_file)
+        self.slide = self.prs.slides[0]
+        self.shape_paths = index_shape_paths(self.slide.shapes, set(TEMPLATE_SHAPE_NAMES))
+        self._sp_tree = self.slide.shapes._spTree
+        self._pristine = [copy.deepcopy(el) for el in self._sp_tree]
+
+    def find_shape(self, name):
+        path = self.shape_paths.get(name)
+        return resolve_shape_path(self.slide, path) if path else None
+
+    def reset(self):
+        """Puts the slide back to its untouched template state."""
+        for el in list(self._sp_tree):
+            self._sp_tree.remove(el)
+        self._sp_tree.extend(copy.deepcopy(el) for el in self._pristine)
+
+    def render(self, data, output_path):
+        """Fills the slide with one profile and saves it to output_path (a path or file-like object)."""
+        with span("pptx.render"):
+            self.reset()
+            fill_slide(self.slide, data, find_shape=self.find_shape)
+            with span("pptx.save"):
+                self.prs.save(output_path)
+
+class DeckBuilder:
+    """
+    One deck holding a slide per profile, all cloned in memory from the template slide.
+
+    The template is parsed once; each added slide gets a deep copy of the
+    template's shape tree (with its relationships, e.g. tags and images,
+    re-pointed at the shared parts) and is filled through the same precomputed
+    shape paths as CompiledTemplate. The template slide itself is dropped on save.
+    """
+
+    SKIPPED_RELTYPES = (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE)
+    REL_ATTRS = (qn('r:id'), qn('r:embed'), qn('r:link'))
+    SP_TREE = qn('p:spTree')
+    # PowerPoint's per-slide id (p:cSld/p:extLst); each clone needs its own
+    CREATION_ID = "{http://schemas.microsoft.com/office/powerpoint/2010/main}creationId"
+
+    def __init__(self, template_file=TEMPLATE_FILE):
+        self.prs = Presentation(template_file)
+        self.template = self.prs.slides[0]
+        self.shape_paths = index_shape_paths(self.template.shapes, set(TEMPLATE_SHAPE_NAMES))
+        self._pristine = copy.deepcopy(self.template._element.cSld)
+        self._rels = [rel for rel in self.template.part.rels.values() if rel.reltype not in self.SKIPPED_RELTYPES]
+        self._creation_ids = {el.get("val") for el in self._pristine.iter(self.CREATION_ID)}
+        self.count = 0
+
+    def _new_creation_id(self):
+        while True:
+            value = str(random.getrandbits(32))
+            if value not in self._creation_ids:
+                self._creation_ids.add(value)
+                return value
+
+    def add(self, data):
+        """Appends one slide filled with `data`; if filling fails the slide is dropped and the error re-raised."""
+        with span("pptx.deck_slide"):
+            slide = self.prs.slides.add_slide(self.template.slide_layout)
+            try:
+                self._fill(slide, data)
+            except Exception:
+                slide_id = self.prs.slides._sldIdLst[-1]
+                self.prs.slides._sldIdLst.remove(slide_id)
+                self.prs.part.drop_rel(slide_id.rId)
+                raise
+        self.count += 1
+
+    def _fill(self, slide, data):
+        c_sld = copy.deepcopy(self._pristine)
+        rids = {}
+        for rel in self._rels:
+            target = rel.target_ref if rel.is_external else rel.target_part
+            rids[rel.rId] = slide.part.relate_to(target, rel.reltype, is_external=rel.is_external)
+        for el in c_sld.iter():
+            for attr in self.REL_ATTRS:
+                if el.get(attr) in rids:
+                    el.set(attr, rids[el.get(attr)])
+        for el in c_sld.iter(self.CREATION_ID):
+            el.set("val", self._new_creation_id())
+        # Swap the children rather than the cSld element itself: slide.shapes already holds the spTree
+        sp_tree = slide._element.cSld.spTree
+        for el in list(sp_tree):
+            sp_tree.remove(el)
+        sp_tree.extend(list(c_sld.spTree))
+        for el in c_sld:
+            if el.tag != self.SP_TREE:
+                slide._element.cSld.append(el)
+
+        def find_shape(name):
+            path = self.shape_paths.get(name)
+            return resolve_shape_path(slide, path) if path else None
+
+        fill_slide(slide, data, find_shape=find_shape)
+
+    def save(self, output_path):
+        """Writes the deck (path or file-like object); the builder is spent afterwards."""
+        slide_ids = self.prs.slides._sldIdLst
+        template_id = slide_ids[0]
+        slide_ids.remove(template_id)
+        self.prs.part.drop_rel(template_id.rId)
+        with span("pptx.save", slides=self.count):
+            self.prs.save(output_path)
+
+def render_deck(named_profiles, output_path, template_file=TEMPLATE_FILE, max_slides=MAX_SLIDES_PER_DECK):
+    """
+    Renders (name, profile) pairs into one multi-slide deck; returns (paths written, failures).
+
+    A profile that fails to render is left out of the deck and reported in
+    failures as {"name", "error"}; the rest of the deck is still built.
+
+    Profiles are consumed one at a time, so only the slides themselves stay in
+    memory. Past `max_slides` the deck is split into numbered parts
+    (name-001.pptx, name-002.pptx, ...) to cap peak memory; the template file
+    is read from disk once and each part is built from those bytes.
+    Raises ValueError when no profile could be rendered, rather than writing nothing.
+    """
+    with open(template_file, 'rb') as f:
+        template_bytes = f.read()
+    stem, ext = os.path.splitext(output_path)
+    written, failures, builder = [], [], None
+    for name, data in named_profiles:
+        if builder is None:
+            builder = DeckBuilder(io.BytesIO(template_bytes))
+        try:
+            builder.add(data)
+        except Exception as e:
+            failures.append({"name": name, "error": f"{type(e).__name__}: {e}"})
+            continue
+        if max_slides and builder.count >= max_slides:
+            written.append(f"{stem}-{len(written) + 1:03d}{ext}")
+            builder.save(written[-1])
+            builder = None  # frees the finished part before the next one grows
+    if builder is not None and builder.count:
+        written.append(f"{stem}-{len(written) + 1:03d}{ext}")
+        builder.save(written[-1])
+    if not written:
+        raise ValueError(f"no profiles to render into a deck ({len(failures)} failed)")
+    # A deck that never needed splitting keeps the requested name
+    if len(written) == 1:
+        os.replace(written[0], output_path)
+        written = [output_path]
+    return written, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the template slide from json_output.json.")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"Loading {TEMPLATE_FILE}...")
+    try:
+        with open(JSON_FILE, 'r') as f:
+            data = json.load(f)
+        prs = Presentation(TEMPLATE_FILE)
+        slide = prs.slides[0]
+    except Exception as e:
+        print(f"Error loading files: {e}")
+        return
 
-    prs.save(OUTPUT_FILE)
+    with instrumented_run(args, "json_to_pptx"):
+        fill_slide(slide, data, verbose=True)
+        with span("pptx.save"):
+            prs.save(OUTPUT_FILE)
     print(f"Success! Saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
 import json
+import argparse
+
+from telemetry import add_telemetry_arguments, instrumented_run, traced
 
 # The JSON output you provided
 # JSON_INPUT = {
@@ -56,6 +59,23 @@ def escape_sql(text: str) -> str:
     """Escapes single quotes for SQL insertion."""
     return text.replace("'", "''")
 
+def executive_row(data: dict) -> tuple:
+    """Column values for the executives table, in (title, gender, experience, sector_focus, location) order."""
+    return (data['title'], data['gender'], data['experience_summary'], data['sector_focus'], data['location'])
+
+def highlight_rows(data: dict, executive_id) -> list[tuple]:
+    """executive_highlights rows: (executive_id, position_title, company_description, details, display_order)."""
+    # Bound parameters take real newlines; generate_sql_script writes them as \\n escapes instead
+    return [
+        (executive_id, exp['job_title'], exp['description'], "\n".join(exp['achievements']), i)
+        for i, exp in enumerate(data['experience'], start=1)
+    ]
+
+def strength_rows(data: dict, executive_id) -> list[tuple]:
+    """executive_strengths rows: (executive_id, strength_description, display_order)."""
+    return [(executive_id, strength, i) for i, strength in enumerate(data['core_strengths'], start=1)]
+
+@traced("sql.generate_script")
 def generate_sql_script(data: dict, placeholder_id: str = "[EXECUTIVE_ID_PLACEHOLDER]") -> str:
     """
     Converts the structured executive JSON data into a series of SQL INSERT statements.
@@ -119,13 +139,17 @@ VALUES
     return "\n".join(sql_script).strip()
 
 # --- Execution ---
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Turn json_output.json into an SQL insertion script.")
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
 
     json_input_path = "json_output.json"
-    with open(json_input_path, 'r', encoding='utf-8') as file:
-        raw_json_input = file.read()
-        json_input = json.loads(raw_json_input)
-        sql_output = generate_sql_script(json_input)
+    with instrumented_run(args, "json_to_sql"):
+        with open(json_input_path, 'r', encoding='utf-8') as file:
+            raw_json_input = file.read()
+            json_input = json.loads(raw_json_input)
+            sql_output = generate_sql_script(json_input)
     
     print("--- Generated SQL Insertion Script ---")
     sql_output_path = "sql_output.sql"
@@ -135,4 +159,9 @@ if __name__ == "__main__":
     
     print("\n" + "="*50)
     print("### ⚠️ Action Required:")
-    print("Replace all instances of '[EXECUTIVE_ID_PLACEHOLDER]' with the actual ID generated by the first INSERT statement (INSERT INTO executives).")
\ No newline at end of file
+    print("Replace all instances of '[EXECUTIVE_ID_PLACEHOLDER]' with the actual ID generated by the first INSERT statement (INSERT INTO executives).")
+    print("To skip this step, load the profile straight into the database with db_loader.py.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
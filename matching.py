@@ -0,0 +1,201 @@
+import os
+import re
+import json
+import zlib
+import time
+import argparse
+from itertools import chain
+import numpy as np
+
+from tokens import normalize_tokens
+from profile_store import ProfileStore, is_store
+
+# --- CONFIGURATION ---
+# Hashed feature dimensions per block; small enough for a fast dense GEMM, large enough to keep collisions rare
+SECTOR_DIM = 128
+STRENGTHS_DIM = 256
+LOCATION_DIM = 32
+
+# Score weights (sum to 1, so scores fall in [0, 1])
+WEIGHT_SECTOR = 0.40
+WEIGHT_STRENGTHS = 0.35
+WEIGHT_LOCATION = 0.10
+WEIGHT_REMOTE = 0.05  # executive is open to remote work
+WEIGHT_SENIORITY = 0.10
+
+SENIORITY_CAP_YEARS = 25  # tenure at which the seniority bonus maxes out
+TOP_K = 5
+CHUNK_ROWS = 2048  # entrepreneurs scored per matrix block, bounds peak memory
+GROUP_COLS = 64  # executives per group in the two-stage top-k
+
+_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*years", re.IGNORECASE)
+
+
+def _hashed_block(texts: list[str], dim: int) -> np.ndarray:
+    """
+    Bag-of-words feature hashing into `dim` columns, L2-normalised per row.
+
+    Each distinct text is tokenized once and each distinct token hashed once;
+    the counts are accumulated in one bincount over flat (row, column) indices.
+    """
+    unique = {}
+    rows = [unique.setdefault(text, len(unique)) for text in texts]
+    token_lists = [normalize_tokens(text) for text in unique]
+    tokens = list(chain.from_iterable(token_lists))
+    vocabulary = {}
+    token_ids = np.array([vocabulary.setdefault(token, len(vocabulary)) for token in tokens], dtype=np.int64)
+    # crc32 is stable across runs, unlike the salted built-in hash()
+    columns = np.array([zlib.crc32(token.encode()) % dim for token in vocabulary], dtype=np.int64)
+    lengths = np.array([len(t) for t in token_lists], dtype=np.int64)
+    flat = np.repeat(np.arange(len(unique), dtype=np.int64) * dim, lengths) + columns[token_ids] if tokens \
+        else np.empty(0, dtype=np.int64)
+    matrix = np.bincount(flat, minlength=len(unique) * dim).astype(np.float32).reshape(len(unique), dim)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix[rows]
+
+
+def experience_years(summary: str | None) -> float:
+    """Tenure in years from summaries like '30+ years in banking'; 0 when none is stated."""
+    match = _YEARS.search(summary or "")
+    return float(match.group(1)) if match else 0.0
+
+
+def encode_executives(executives: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes executive profiles (json_output.json shape) as a feature matrix plus a per-executive bias.
+
+    Strength features come from core_strengths and the role titles in `experience`.
+    The bias holds the parts of the score that don't depend on the entrepreneur:
+    remote availability and seniority.
+    """
+    sectors = [p.get("sector_focus", "") for p in executives]
+    strengths = [" ".join(p.get("core_strengths", []) + [e.get("job_title", "") for e in p.get("experience", [])])
+                 for p in executives]
+    locations = [p.get("location", "") for p in executives]
+    features = np.hstack([
+        _hashed_block(sectors, SECTOR_DIM),
+        _hashed_block(strengths, STRENGTHS_DIM),
+        _hashed_block(locations, LOCATION_DIM),
+    ])
+
+    remote = np.array(["remote" in normalize_tokens(loc) for loc in locations], dtype=np.float32)
+    years = np.array([experience_years(p.get("experience_summary")) for p in executives], dtype=np.float32)
+    seniority = np.minimum(years / SENIORITY_CAP_YEARS, 1.0)
+    bias = WEIGHT_REMOTE * remote + WEIGHT_SENIORITY * seniority
+    return features, bias
+
+
+def encode_entrepreneurs(entrepreneurs: list[dict]) -> np.ndarray:
+    """
+    Encodes entrepreneur profiles with the block weights folded in, so one
+    matrix product against encode_executives() gives the weighted similarity sum.
+
+    Entrepreneurs use the same sector_focus / location fields plus `needed_strengths`
+    (falls back to core_strengths).
+    """
+    sectors = [p.get("sector_focus", "") for p in entrepreneurs]
+    needs = [" ".join(p.get("needed_strengths") or p.get("core_strengths", [])) for p in entrepreneurs]
+    locations = [p.get("location", "") for p in entrepreneurs]
+    return np.hstack([
+        WEIGHT_SECTOR * _hashed_block(sectors, SECTOR_DIM),
+        WEIGHT_STRENGTHS * _hashed_block(needs, STRENGTHS_DIM),
+        WEIGHT_LOCATION * _hashed_block(locations, LOCATION_DIM),
+    ])
+
+
+def top_k_matches(entrepreneur_features: np.ndarray, executive_features: np.ndarray, executive_bias: np.ndarray,
+                  k: int = TOP_K, chunk_rows: int = CHUNK_ROWS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    All-pairs compatibility scores, reduced to the best `k` executives per entrepreneur.
+
+    Scores are computed a block of entrepreneurs at a time (one GEMM each), so peak
+    memory is chunk_rows x n_executives floats. Each block is reduced right after
+    its GEMM: executives are split into groups of GROUP_COLS, and since the k best
+    scores always lie in the k groups with the highest maximum, only those k groups
+    are partitioned and sorted. Returns (indices, scores), both of shape
+    (n_entrepreneurs, k), best match first.
+    """
+    n_entrepreneurs, n_executives = len(entrepreneur_features), len(executive_features)
+    k = min(k, n_executives)
+    indices = np.empty((n_entrepreneurs, k), dtype=np.int64)
+    scores = np.empty((n_entrepreneurs, k), dtype=np.float32)
+
+    groups = -(-n_executives // GROUP_COLS)
+    padded = groups * GROUP_COLS
+    # Padding executives score -inf, so they never win a group or a top-k slot
+    executive_t = np.zeros((executive_features.shape[1], padded), dtype=np.float32)
+    executive_t[:, :n_executives] = executive_features.T
+    bias = np.full(padded, -np.inf, dtype=np.float32)
+    bias[:n_executives] = executive_bias
+    offsets = np.arange(GROUP_COLS)
+
+    for start in range(0, n_entrepreneurs, chunk_rows):
+        block = entrepreneur_features[start:start + chunk_rows] @ executive_t
+        block += bias
+        if k < groups:
+            group_max = block.reshape(len(block), groups, GROUP_COLS).max(axis=2)
+            best_groups = np.argpartition(group_max, -k, axis=1)[:, -k:]
+            candidates = (best_groups[:, :, None] * GROUP_COLS + offsets).reshape(len(block), -1)
+        else:
+            candidates = np.broadcast_to(np.arange(n_executives), (len(block), n_executives))
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        # argpartition finds the top k in O(n); only those k get sorted
+        top = np.argpartition(candidate_scores, -k, axis=1)[:, -k:] if k < candidates.shape[1] \
+            else np.broadcast_to(np.arange(k), (len(block), k))
+        top_scores = np.take_along_axis(candidate_scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices[start:start + len(block)] = np.take_along_axis(np.take_along_axis(candidates, top, axis=1), order, axis=1)
+        scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+def match(entrepreneurs: list[dict], executives: list[dict], k: int = TOP_K) -> list[list[tuple[int, float]]]:
+    """Top-k (executive index, compatibility score 0-100) per entrepreneur, best first."""
+    executive_features, bias = encode_executives(executives)
+    indices, scores = top_k_matches(encode_entrepreneurs(entrepreneurs), executive_features, bias, k)
+    return [[(int(i), round(float(s) * 100, 1)) for i, s in zip(row_i, row_s)] for row_i, row_s in zip(indices, scores)]
+
+
+def load_named_profiles(source: str) -> tuple[list[str], list[dict]]:
+    """(names, profiles) from a profile store, a directory of JSON files or one JSON file holding a profile or a list."""
+    if is_store(source):
+        with ProfileStore(source) as store:
+            return store.ids, list(store)
+    if os.path.isdir(source):
+        names, profiles = [], []
+        for name in sorted(os.listdir(source)):
+            if name.endswith(".json"):
+                with open(os.path.join(source, name), 'r', encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+                names.append(os.path.splitext(name)[0])
+        return names, profiles
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    profiles = data if isinstance(data, list) else [data]
+    return [p.get("name") or f"#{i}" for i, p in enumerate(profiles)], profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match entrepreneurs with the most compatible C-suite executives.")
+    parser.add_argument("executives", help="Executive profile JSON (object or list), a directory of them or a profile store")
+    parser.add_argument("entrepreneurs", help="Entrepreneur profile JSON (object or list) or a directory of them")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    executive_names, executives = load_named_profiles(args.executives)
+    entrepreneur_names, entrepreneurs = load_named_profiles(args.entrepreneurs)
+
+    start = time.perf_counter()
+    results = match(entrepreneurs, executives, args.top_k)
+    elapsed = time.perf_counter() - start
+
+    print(f"--- 🤝 Executive Matching ({len(entrepreneurs)} entrepreneurs x {len(executives)} executives, {elapsed:.3f}s) ---")
+    for name, matches in zip(entrepreneur_names, results):
+        print(f"\n{name}:")
+        for rank, (index, score) in enumerate(matches, start=1):
+            print(f"  {rank}. {executive_names[index]} – {executives[index].get('title', '')} ({score}%)")
+
+
+if __name__ == "__main__":
+    main()
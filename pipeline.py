@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+
+from cv_batch import add_backend_arguments, build_backend, collect_cv_files, print_backend_report
+from json_to_sql import generate_sql_script
+from profile_index import ProfileIndex
+from telemetry import add_telemetry_arguments, count, instrumented_run, span
+
+# --- CONFIGURATION ---
+OUTPUT_DIR = "pipeline_output"
+QUEUE_SIZE = 16  # max profiles waiting between two stages
+RENDER_WORKERS = 2
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+class Stage:
+    """
+    One pipeline step running on its own worker threads between two bounded queues.
+
+    `fn(item)` returns the item to hand downstream (or None to stop it there).
+    A failure is recorded against the item and the stream carries on.
+    """
+
+    def __init__(self, name: str, fn, inbox: queue.Queue, outbox: queue.Queue | None, workers: int = 1):
+        self.name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.failures = []
+        self.busy_seconds = 0.0
+        self.started = None
+        self.finished = None
+        self._active = self.workers
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True) for i in range(self.workers)]
+
+    def start(self):
+        self.started = time.perf_counter()
+        for thread in self._threads:
+            thread.start()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                # Let sibling workers see the marker too; the last one out forwards it
+                self.inbox.put(_DONE)
+                with self._lock:
+                    self._active -= 1
+                    last = self._active == 0
+                if last:
+                    self.finished = time.perf_counter()
+                    if self.outbox is not None:
+                        self.outbox.put(_DONE)
+                return
+
+            start = time.perf_counter()
+            try:
+                with span(f"stage.{self.name}", profile_id=item[0]):
+                    result = self.fn(item)
+            except Exception as e:
+                count("stage_failures_total", stage=self.name)
+                with self._lock:
+                    self.failures.append((item[0], f"{type(e).__name__}: {e}"))
+                    self.busy_seconds += time.perf_counter() - start
+                continue
+            with self._lock:
+                self.processed += 1
+                self.busy_seconds += time.perf_counter() - start
+            if result is not None and self.outbox is not None:
+                self.outbox.put(result)
+
+    def report(self) -> dict:
+        wall = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": len(self.failures),
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "profiles_per_second": round(self.processed / wall, 2) if wall > 0 else None,
+        }
+
+
+def profile_paths(output_dir: str, profile_id: str) -> dict:
+    """Per-profile output locations, so parallel runs and profiles never overwrite each other."""
+    base = os.path.join(output_dir, profile_id)
+    return {"json": base + ".json", "sql": base + ".sql", "pptx": base + ".pptx"}
+
+
+def run_pipeline(backend, cv_paths: list[str], output_dir: str = OUTPUT_DIR, parse_workers: int = 8,
+                 render_workers: int = RENDER_WORKERS, queue_size: int = QUEUE_SIZE,
+                 render_pptx: bool = True, index: ProfileIndex | None = None) -> list[Stage]:
+    """
+    Streams each CV through parse -> SQL -> PPTX with every stage running concurrently.
+
+    Items travel as (profile_id, payload) tuples. With an `index`, every parsed
+    profile is also added to it as it passes the SQL stage. Returns the stages so
+    callers can read their throughput reports and failures.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    def parse(item):
+        profile_id, cv_path = item
+        with open(cv_path, 'r', encoding='utf-8') as f:
+            data = backend.parse(f.read())
+        with open(profile_paths(output_dir, profile_id)["json"], 'w') as f:
+            f.write(json.dumps(data, indent=4))
+        return profile_id, data
+
+    def to_sql(item):
+        profile_id, data = item
+        with open(profile_paths(output_dir, profile_id)["sql"], 'w') as f:
+            f.write(generate_sql_script(data))
+        if index is not None:
+            # The SQL stage has a single worker, so the index is only ever touched from one thread
+            index.add(profile_id, data)
+        return item
+
+    # Each render worker thread compiles the template once and stamps every profile from it
+    templates = threading.local()
+
+    def to_pptx(item):
+        profile_id, data = item
+        if not hasattr(templates, "compiled"):
+            from json_to_pptx import CompiledTemplate  # deferred so --no-pptx never loads python-pptx
+            templates.compiled = CompiledTemplate()
+        templates.compiled.render(data, profile_paths(output_dir, profile_id)["pptx"])
+
+    cv_queue = queue.Queue(maxsize=queue_size)
+    parsed_queue = queue.Queue(maxsize=queue_size)
+    sql_queue = queue.Queue(maxsize=queue_size) if render_pptx else None
+
+    stages = [
+        Stage("parse", parse, cv_queue, parsed_queue, parse_workers),
+        Stage("sql", to_sql, parsed_queue, sql_queue),
+    ]
+    if render_pptx:
+        stages.append(Stage("pptx", to_pptx, sql_queue, None, render_workers))
+
+    for stage in stages:
+        stage.start()
+    # Feeding blocks once the parse queue is full, which keeps memory bounded
+    for cv_path in cv_paths:
+        cv_queue.put((os.path.splitext(os.path.basename(cv_path))[0], cv_path))
+    cv_queue.put(_DONE)
+    for stage in stages:
+        stage.join()
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CV text -> JSON -> SQL -> PPTX for a batch of CVs in one process.")
+    parser.add_argument("source", help="Directory of *.txt CVs or a manifest file listing CV paths")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--render-workers", type=int, default=RENDER_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--no-pptx", action="store_true", help="Stop after the SQL stage")
+    parser.add_argument("--index", help="Add every parsed profile to this search index directory (see profile_index.py)")
+    add_backend_arguments(parser)
+    add_telemetry_arguments(parser)
+    args = parser.parse_args()
+
+    cv_paths = collect_cv_files(args.source)
+    cv_paths_by_id = {os.path.splitext(os.path.basename(path))[0]: path for path in cv_paths}
+    backend, cache, dead_letter = build_backend(args)
+    index = ProfileIndex.load(args.index) if args.index else None
+
+    print(f"--- 🚀 CV Pipeline ({len(cv_paths)} CVs, model {backend.model_name}) ---")
+    start = time.perf_counter()
+    with instrumented_run(args, "pipeline"):
+        stages = run_pipeline(backend, cv_paths, args.output_dir, args.concurrency, args.render_workers,
+                              args.queue_size, render_pptx=not args.no_pptx, index=index)
+        if index is not None:
+            index.save(args.index)
+    elapsed = time.perf_counter() - start
+
+    for stage in stages:
+        r = stage.report()
+        print(f"  {r['stage']:<6} {r['processed']:>6} ok  {r['failed']:>4} failed  "
+              f"{r['wall_seconds']:>8.2f}s wall  {r['busy_seconds']:>8.2f}s busy  {r['profiles_per_second'] or 0:>8.1f}/s")
+        for profile_id, error in stage.failures:
+            print(f"  ❌ [{stage.name}] {profile_id}: {error}")
+            if stage.name == "parse":
+                dead_letter.record(cv_paths_by_id[profile_id], error)
+
+    print("\n" + "="*50)
+    print(f"Pipeline finished in {elapsed:.2f}s.")
+    print_backend_report(cache, dead_letter, backend)
+    print(f"Outputs written to '{args.output_dir}'.")
+
+
+if __name__ == "__main__":
+    main()
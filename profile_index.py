@@ -0,0 +1,376 @@
+import os
+import json
+import math
+import time
+import shutil
+import argparse
+from itertools import chain
+from collections import defaultdict
+import numpy as np
+
+from tokens import normalize_tokens
+
+# --- CONFIGURATION ---
+INDEX_DIR = "profile_index"
+INDEX_VERSION = 2
+MANIFEST_FILE = "manifest.json"  # lists the live segments; replaced last on every save
+SEGMENT_FILE = "segment.json"
+MAX_SEGMENTS = 8  # delta segments beyond this are merged into one on save
+TOP_K = 10
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term-frequency boost per profile field: a match in the title counts more than one in an achievement
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "sector_focus": 2.0,
+    "location": 1.5,
+    "core_strengths": 1.5,
+    "job_titles": 1.5,
+    "achievements": 1.0,
+}
+
+
+def profile_fields(profile: dict) -> dict:
+    """The searchable text of a profile (json_output.json shape), per field."""
+    experience = profile.get("experience", [])
+    return {
+        "title": profile.get("title", ""),
+        "sector_focus": profile.get("sector_focus", ""),
+        "location": profile.get("location", ""),
+        "core_strengths": " ".join(profile.get("core_strengths", [])),
+        "job_titles": " ".join(e.get("job_title", "") for e in experience),
+        "achievements": " ".join(a for e in experience for a in e.get("achievements", [])),
+    }
+
+
+def term_weights(profile: dict) -> dict[str, float]:
+    """Field-boosted term frequencies for one profile."""
+    weights = defaultdict(float)
+    for field, text in profile_fields(profile).items():
+        boost = FIELD_WEIGHTS[field]
+        for token in normalize_tokens(text):
+            weights[token] += boost
+    return dict(weights)
+
+
+class _Segment:
+    """
+    One immutable, memory-mapped slice of the index on disk.
+
+    Postings are grouped by term: term i owns docs/tfs[offsets[i]:offsets[i + 1]],
+    where docs are positions into this segment's doc_ids. `deleted` lists doc ids
+    this segment removes from the segments before it.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, SEGMENT_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.name = os.path.basename(path)
+        self.doc_ids = meta["doc_ids"]
+        self.deleted = meta["deleted"]
+        self.terms = {token: i for i, token in enumerate(meta["terms"])}
+        self.lengths, self.offsets, self.docs, self.tfs = (
+            np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in ("lengths", "offsets", "docs", "tfs"))
+        self.slots = None  # global slot of each doc, set when the index is opened
+
+    def postings(self, token: str):
+        i = self.terms.get(token)
+        if i is None:
+            return None
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return self.slots[self.docs[start:stop]], self.tfs[start:stop]
+
+
+def _write_segment(path: str, doc_ids: list[str], lengths, deleted: list[str], terms: list[str],
+                   offsets, docs, tfs):
+    os.makedirs(path)
+    for name, values, dtype in (("lengths", lengths, np.float32), ("offsets", offsets, np.int64),
+                                ("docs", docs, np.int32), ("tfs", tfs, np.float32)):
+        np.save(os.path.join(path, name + ".npy"), np.asarray(values, dtype=dtype))
+    with open(os.path.join(path, SEGMENT_FILE), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"doc_ids": doc_ids, "deleted": deleted, "terms": terms}))
+
+
+class ProfileIndex:
+    """
+    Inverted index (token -> {doc_id: boosted tf}) with BM25 ranking, persisted
+    as a directory of append-only segments.
+
+    Opening an index memory-maps its segments without reading the postings.
+    Profiles added or removed afterwards are held in memory and save() appends
+    them as one new delta segment, so updates cost the size of the change, not
+    of the index. A newer segment's version of a doc id replaces any earlier one.
+    Past MAX_SEGMENTS the segments are merged into one.
+
+    Queries run on NumPy arrays: every document version gets a fixed integer
+    slot, and each queried token's postings are gathered from the segments and
+    the pending changes once, then reused until an add touches that token.
+    Removed and replaced slots are masked out at query time.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.postings = {}  # token -> {doc_id: tf}, only for profiles added since the last save
+        self.total_length = 0.0
+        self._segments = []
+        self._next_segment = 1
+        self._pending_terms = {}  # doc_id -> tokens, for pending profiles
+        self._deleted = set()  # saved doc ids removed since the last save
+        self._slots = {}  # live doc_id -> slot; slots are never reused, so gathered arrays stay valid
+        self._slot_ids = []
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._compiled = {}  # token -> (slots, tfs)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._slots
+
+    def remove(self, doc_id: str):
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return
+        if doc_id in self._pending_terms:
+            for token in self._pending_terms.pop(doc_id):
+                docs = self.postings[token]
+                del docs[doc_id]
+                if not docs:
+                    del self.postings[token]
+                self._compiled.pop(token, None)
+        else:
+            self._deleted.add(doc_id)
+        self.total_length -= float(self._lengths[slot])
+        self._live[slot] = False
+
+    def add(self, doc_id: str, profile: dict):
+        """Indexes a profile under doc_id, replacing any earlier version of it."""
+        self.remove(doc_id)
+        weights = term_weights(profile)
+        for token, weight in weights.items():
+            self.postings.setdefault(token, {})[doc_id] = weight
+            self._compiled.pop(token, None)
+        self._pending_terms[doc_id] = list(weights)
+        length = sum(weights.values())
+        self.total_length += length
+        slot = self._slots[doc_id] = self._new_slot(doc_id)
+        self._lengths[slot] = length
+        self._live[slot] = True
+
+    def _new_slot(self, doc_id: str) -> int:
+        slot = len(self._slot_ids)
+        self._slot_ids.append(doc_id)
+        if slot >= len(self._lengths):
+            # Grow geometrically so appends stay amortized O(1)
+            size = max(1024, 2 * len(self._lengths))
+            self._lengths = np.concatenate([self._lengths, np.zeros(size - len(self._lengths), dtype=np.float32)])
+            self._live = np.concatenate([self._live, np.zeros(size - len(self._live), dtype=bool)])
+        return slot
+
+    def _token_arrays(self, token: str):
+        compiled = self._compiled.get(token)
+        if compiled is None:
+            parts = [p for p in (segment.postings(token) for segment in self._segments) if p is not None]
+            docs = self.postings.get(token)
+            if docs:
+                parts.append((np.fromiter((self._slots[doc_id] for doc_id in docs), dtype=np.int64, count=len(docs)),
+                              np.fromiter(docs.values(), dtype=np.float32, count=len(docs))))
+            if not parts:
+                compiled = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+            else:
+                compiled = (np.concatenate([slots for slots, _ in parts]).astype(np.int64),
+                            np.concatenate([tfs for _, tfs in parts]).astype(np.float32))
+            self._compiled[token] = compiled
+        return compiled
+
+    def search(self, query: str, k: int = TOP_K) -> list[tuple[str, float]]:
+        """Top-k (doc_id, BM25 score) for a free-text query such as 'CFO, banking, Romania, remote'."""
+        n_docs = len(self._slots)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs
+        scores = np.zeros(len(self._slot_ids), dtype=np.float32)
+        for token in set(normalize_tokens(query)):
+            slots, tfs = self._token_arrays(token)
+            live = self._live[slots]
+            slots, tfs = slots[live], tfs[live]
+            if not len(slots):
+                continue
+            idf = math.log(1 + (n_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[slots] / avg_length)
+            # Slots are unique within one token's postings, so fancy-index += is safe
+            scores[slots] += idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        # Best score first; ties go to the earlier-indexed profile
+        matched = matched[np.lexsort((matched, -scores[matched]))]
+        return [(self._slot_ids[slot], float(scores[slot])) for slot in matched]
+
+    def save(self, path: str = INDEX_DIR):
+        """
+        Persists the changes since the index was opened as one delta segment.
+
+        Saving to a different directory than the one loaded, or past
+        MAX_SEGMENTS, writes all live profiles as a single segment instead.
+        The manifest is replaced last, so readers never see a half-written segment.
+        """
+        if path == self.path and not (self.postings or self._deleted):
+            return
+        if path != self.path:
+            manifest_path = os.path.join(path, MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                # Never reuse the name of a segment that is still listed there
+                with open(manifest_path, 'r') as f:
+                    self._next_segment = max(self._next_segment, json.load(f)["next_segment"])
+        if path != self.path or len(self._segments) >= MAX_SEGMENTS:
+            # With nothing saved yet, the pending profiles are the whole index
+            segments = [self._write_merged(path) if self._segments else self._write_delta(path)]
+        else:
+            segments = [segment.name for segment in self._segments] + [self._write_delta(path)]
+        tmp_path = os.path.join(path, MANIFEST_FILE + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({"version": INDEX_VERSION, "segments": segments, "next_segment": self._next_segment}))
+        os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+        for name in os.listdir(path):
+            if name.startswith("seg-") and name not in segments:
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+        self._open(path)
+
+    def _new_segment_dir(self, path: str) -> str:
+        # A directory the manifest doesn't list is left over from an interrupted save; skip past it
+        while os.path.exists(segment_dir := os.path.join(path, f"seg-{self._next_segment:06d}")):
+            self._next_segment += 1
+        self._next_segment += 1
+        return segment_dir
+
+    def _write_delta(self, path: str) -> str:
+        doc_ids = list(self._pending_terms)
+        position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        terms = sorted(self.postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(self.postings[token]) for token in terms], out=offsets[1:])
+        segment_dir = self._new_segment_dir(path)
+        _write_segment(segment_dir, doc_ids, self._lengths[[self._slots[doc_id] for doc_id in doc_ids]],
+                       sorted(self._deleted), terms, offsets,
+                       np.fromiter(map(position.__getitem__, chain.from_iterable(self.postings[t] for t in terms)),
+                                   dtype=np.int32, count=offsets[-1]),
+                       np.fromiter(chain.from_iterable(self.postings[t].values() for t in terms),
+                                   dtype=np.float32, count=offsets[-1]))
+        return os.path.basename(segment_dir)
+
+    def _write_merged(self, path: str) -> str:
+        """Every live profile in one segment, postings sorted by term then slot."""
+        vocabulary = sorted(set().union(*(segment.terms for segment in self._segments), self.postings))
+        term_ids = {token: i for i, token in enumerate(vocabulary)}
+        terms = [np.zeros(0, dtype=np.int64)]
+        slots = [np.zeros(0, dtype=np.int64)]
+        tfs = [np.zeros(0, dtype=np.float32)]
+        for segment in self._segments:
+            counts = np.diff(segment.offsets)
+            local = np.array([term_ids[token] for token in segment.terms], dtype=np.int64)
+            terms.append(np.repeat(local, counts))
+            slots.append(segment.slots[segment.docs])
+            tfs.append(np.asarray(segment.tfs))
+        for token, docs in self.postings.items():
+            terms.append(np.full(len(docs), term_ids[token], dtype=np.int64))
+            slots.append(np.fromiter((self._slots[doc_id] for doc_id in docs), dtype=np.int64, count=len(docs)))
+            tfs.append(np.fromiter(docs.values(), dtype=np.float32, count=len(docs)))
+        terms, slots, tfs = np.concatenate(terms), np.concatenate(slots), np.concatenate(tfs)
+        live = self._live[slots]
+        terms, slots, tfs = terms[live], slots[live], tfs[live]
+        order = np.lexsort((slots, terms))
+        terms, slots, tfs = terms[order], slots[order], tfs[order]
+
+        live_slots = np.flatnonzero(self._live[:len(self._slot_ids)])
+        position = np.zeros(len(self._slot_ids), dtype=np.int64)
+        position[live_slots] = np.arange(len(live_slots))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=offsets[1:])
+        # Terms left without live postings are harmless: their range is empty
+        segment_dir = self._new_segment_dir(path)
+        _write_segment(segment_dir, [self._slot_ids[slot] for slot in live_slots], self._lengths[live_slots], [],
+                       vocabulary, offsets, position[slots], tfs)
+        return os.path.basename(segment_dir)
+
+    def _open(self, path: str):
+        """Resets this index to the saved state of `path`."""
+        self.__init__()
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest["version"] != INDEX_VERSION:
+            raise ValueError(f"Unsupported profile index version {manifest['version']} in '{path}'")
+        self._next_segment = manifest["next_segment"]
+        for name in manifest["segments"]:
+            segment = _Segment(os.path.join(path, name))
+            # Newest wins: this segment's deletions and doc ids retire older versions
+            for doc_id in segment.deleted + segment.doc_ids:
+                self._slots.pop(doc_id, None)
+            base = len(self._slot_ids)
+            segment.slots = np.arange(base, base + len(segment.doc_ids), dtype=np.int64)
+            self._slot_ids.extend(segment.doc_ids)
+            self._slots.update(zip(segment.doc_ids, segment.slots.tolist()))
+            self._segments.append(segment)
+        self._lengths = np.concatenate([np.asarray(s.lengths, dtype=np.float32) for s in self._segments] or [self._lengths])
+        self._live = np.zeros(len(self._lengths), dtype=bool)
+        self._live[list(self._slots.values())] = True
+        self._lengths[~self._live] = 0.0
+        self.total_length = float(self._lengths.sum(dtype=np.float64))
+
+    @classmethod
+    def load(cls, path: str = INDEX_DIR) -> "ProfileIndex":
+        """Opens a saved index, or returns an empty one bound to `path` if none exists there yet."""
+        if os.path.isfile(path):
+            raise ValueError(f"'{path}' is a single-file index from an older version; rebuild it with 'add'")
+        index = cls()
+        index._open(path)
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the BM25 index over parsed profiles.")
+    parser.add_argument("--index", default=INDEX_DIR, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Index (or re-index) profile JSON files")
+    add.add_argument("paths", nargs="+", help="Profile JSON files or directories of them")
+    search = commands.add_parser("search", help="Query the index")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    try:
+        index = ProfileIndex.load(args.index)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+    if args.command == "add":
+        count = 0
+        for path in args.paths:
+            files = ([os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json")]
+                     if os.path.isdir(path) else [path])
+            for file_path in files:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    index.add(os.path.splitext(os.path.basename(file_path))[0], json.load(f))
+                count += 1
+        index.save(args.index)
+        print(f"--- 🔎 Indexed {count} profiles; '{args.index}' now holds {len(index)} ---")
+    else:
+        start = time.perf_counter()
+        results = index.search(args.query, args.k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"--- 🔎 '{args.query}': {len(results)} results from {len(index)} profiles in {elapsed_ms:.1f} ms ---")
+        for rank, (doc_id, score) in enumerate(results, start=1):
+            print(f"  {rank}. {doc_id} ({score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import os
+import json
+import mmap
+import time
+import argparse
+import numpy as np
+
+# --- CONFIGURATION ---
+STORE_DIR = "profiles.store"
+STORE_VERSION = 1
+META_FILE = "meta.json"  # written last, so a store without it is incomplete
+
+SCALAR_FIELDS = ["title", "gender", "experience_summary", "sector_focus", "location"]
+ROLE_FIELDS = ["job_title", "description"]
+MISSING = np.uint32(0xFFFFFFFF)  # string id of a scalar that was absent from the profile
+
+
+class StoreWriter:
+    """
+    Builds a columnar profile store in memory, then writes it in one go.
+
+    Every string goes into one deduplicated string table (locations, genders and
+    sectors repeat a lot); the columns hold uint32 ids into it. Lists are
+    flattened into one value column plus an offsets column per level:
+    profile -> roles -> achievements, and profile -> core_strengths.
+    """
+
+    def __init__(self):
+        self._string_ids = {}
+        self.strings = []
+        self.ids = []
+        self.scalars = {name: [] for name in SCALAR_FIELDS}
+        self.extra = []
+        self.role_offsets = [0]
+        self.roles = {name: [] for name in ROLE_FIELDS}
+        self.achievement_offsets = [0]
+        self.achievements = []
+        self.strength_offsets = [0]
+        self.strengths = []
+
+    def _intern(self, text: str | None) -> int:
+        if text is None:
+            return int(MISSING)
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def append(self, profile_id: str, profile: dict):
+        self.ids.append(self._intern(profile_id))
+        for name in SCALAR_FIELDS:
+            self.scalars[name].append(self._intern(profile.get(name)))
+        # Keys outside the schema (e.g. an entrepreneur's 'name') ride along as one JSON string
+        extra = {k: v for k, v in profile.items() if k not in SCALAR_FIELDS and k not in ("experience", "core_strengths")}
+        self.extra.append(self._intern(json.dumps(extra, ensure_ascii=False)) if extra else int(MISSING))
+
+        for role in profile.get("experience") or []:
+            for name in ROLE_FIELDS:
+                self.roles[name].append(self._intern(role.get(name, "")))
+            self.achievements.extend(self._intern(a) for a in role.get("achievements") or [])
+            self.achievement_offsets.append(len(self.achievements))
+        self.role_offsets.append(len(self.roles[ROLE_FIELDS[0]]))
+        self.strengths.extend(self._intern(s) for s in profile.get("core_strengths") or [])
+        self.strength_offsets.append(len(self.strengths))
+
+    def save(self, path: str = STORE_DIR):
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        encoded = [s.encode("utf-8") for s in self.strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=string_offsets[1:])
+        with open(os.path.join(path, "strings.bin"), 'wb') as f:
+            f.write(b"".join(encoded))
+
+        columns = {
+            "string_offsets": string_offsets,
+            "ids": self.ids,
+            "extra": self.extra,
+            "role_offsets": self.role_offsets,
+            "achievement_offsets": self.achievement_offsets,
+            "achievements": self.achievements,
+            "strength_offsets": self.strength_offsets,
+            "strengths": self.strengths,
+            **{f"scalar_{name}": values for name, values in self.scalars.items()},
+            **{f"role_{name}": values for name, values in self.roles.items()},
+        }
+        for name, values in columns.items():
+            dtype = np.int64 if name.endswith("offsets") else np.uint32
+            np.save(os.path.join(path, name + ".npy"), np.asarray(values, dtype=dtype))
+
+        with open(meta_path, 'w') as f:
+            f.write(json.dumps({"version": STORE_VERSION, "count": len(self.ids), "strings": len(self.strings)}))
+
+
+class ProfileStore:
+    """
+    Read-only, memory-mapped view of a store written by StoreWriter.
+
+    Opening it maps the files without reading them; a profile (or a column) is
+    decoded only when asked for, so scanning one field of the whole corpus
+    touches just that field's pages.
+    """
+
+    def __init__(self, path: str = STORE_DIR):
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != STORE_VERSION:
+            raise ValueError(f"Unsupported profile store version {self.meta['version']} in '{path}'")
+        self.path = path
+        self._columns = {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+                         for name in os.listdir(path) if name.endswith(".npy")}
+        self._strings_file = open(os.path.join(path, "strings.bin"), 'rb')
+        size = os.path.getsize(self._strings_file.name)
+        # mmap refuses empty files
+        self._strings = mmap.mmap(self._strings_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def close(self):
+        if isinstance(self._strings, mmap.mmap):
+            self._strings.close()
+        self._strings_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    def string(self, string_id: int) -> str | None:
+        if string_id == MISSING:
+            return None
+        offsets = self._columns["string_offsets"]
+        return self._strings[offsets[string_id]:offsets[string_id + 1]].decode("utf-8")
+
+    @property
+    def ids(self) -> list[str]:
+        return self.column("id")
+
+    def column(self, name: str) -> list[str | None]:
+        """One scalar field ('id' or a SCALAR_FIELDS name) for every profile, decoding each distinct string once."""
+        ids = self._columns["ids" if name == "id" else f"scalar_{name}"]
+        unique, inverse = np.unique(np.asarray(ids), return_inverse=True)
+        decoded = [self.string(int(string_id)) for string_id in unique]
+        return [decoded[i] for i in inverse]
+
+    def _all_strings(self) -> list[str]:
+        """The whole string table decoded in one pass, for full scans."""
+        data = bytes(self._strings)
+        offsets = self._columns["string_offsets"].tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def profile(self, i: int) -> dict:
+        """Profile `i` back in the JSON shape the model returns (absent lists come back empty)."""
+        return next(self._profiles(self.string, i, i + 1))
+
+    def _profiles(self, string, start: int, stop: int):
+        c = self._columns
+        # Plain lists: indexing them is much cheaper than indexing memory-mapped arrays element by element
+        scalars = [(name, c[f"scalar_{name}"][start:stop].tolist()) for name in SCALAR_FIELDS]
+        extras = c["extra"][start:stop].tolist()
+        role_offsets = c["role_offsets"][start:stop + 1].tolist()
+        r0, r1 = role_offsets[0], role_offsets[-1]
+        role_columns = [(name, c[f"role_{name}"][r0:r1].tolist()) for name in ROLE_FIELDS]
+        achievement_offsets = c["achievement_offsets"][r0:r1 + 1].tolist()
+        a0 = achievement_offsets[0]
+        achievements = c["achievements"][a0:achievement_offsets[-1]].tolist()
+        strength_offsets = c["strength_offsets"][start:stop + 1].tolist()
+        s0 = strength_offsets[0]
+        strengths = c["strengths"][s0:strength_offsets[-1]].tolist()
+
+        for i in range(stop - start):
+            profile = {name: string(values[i]) for name, values in scalars if values[i] != MISSING}
+            experience = []
+            for r in range(role_offsets[i] - r0, role_offsets[i + 1] - r0):
+                role = {name: string(values[r]) for name, values in role_columns}
+                role["achievements"] = [string(a) for a in
+                                        achievements[achievement_offsets[r] - a0:achievement_offsets[r + 1] - a0]]
+                experience.append(role)
+            profile["experience"] = experience
+            profile["core_strengths"] = [string(s) for s in strengths[strength_offsets[i] - s0:strength_offsets[i + 1] - s0]]
+            if extras[i] != MISSING:
+                profile.update(json.loads(string(extras[i])))
+            yield profile
+
+    def __iter__(self):
+        return self._profiles(self._all_strings().__getitem__, 0, len(self))
+
+
+def is_store(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def pack_profiles(named_profiles, path: str = STORE_DIR) -> int:
+    """Writes (profile_id, profile) pairs to a store at `path`; returns the number of profiles."""
+    writer = StoreWriter()
+    for profile_id, profile in named_profiles:
+        writer.append(profile_id, profile)
+    writer.save(path)
+    return len(writer.ids)
+
+
+def unpack_profiles(path: str, output_dir: str) -> int:
+    """Writes every profile in the store back out as <output_dir>/<profile_id>.json."""
+    os.makedirs(output_dir, exist_ok=True)
+    with ProfileStore(path) as store:
+        for profile_id, profile in zip(store.ids, store):
+            with open(os.path.join(output_dir, profile_id + ".json"), 'w') as f:
+                f.write(json.dumps(profile, indent=4))
+        return len(store)
+
+
+def iter_json_profiles(source: str):
+    """(profile_id, profile) pairs from a directory of JSON files, named by file stem."""
+    for name in sorted(os.listdir(source)):
+        if name.endswith(".json"):
+            with open(os.path.join(source, name), 'r', encoding='utf-8') as f:
+                yield os.path.splitext(name)[0], json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack per-profile JSON files into a columnar store, or back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="Directory of profile JSON files -> store")
+    pack.add_argument("source")
+    pack.add_argument("--store", default=STORE_DIR)
+    unpack = commands.add_parser("unpack", help="Store -> directory of profile JSON files")
+    unpack.add_argument("output_dir")
+    unpack.add_argument("--store", default=STORE_DIR)
+    info = commands.add_parser("info", help="Profile count and on-disk size")
+    info.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "pack":
+        count = pack_profiles(iter_json_profiles(args.source), args.store)
+        print(f"--- 🗜️ Packed {count} profiles into '{args.store}' in {time.perf_counter() - start:.2f}s ---")
+    elif args.command == "unpack":
+        count = unpack_profiles(args.store, args.output_dir)
+        print(f"--- 📂 Unpacked {count} profiles into '{args.output_dir}' in {time.perf_counter() - start:.2f}s ---")
+    else:
+        size = sum(os.path.getsize(os.path.join(args.store, name)) for name in os.listdir(args.store))
+        with ProfileStore(args.store) as store:
+            print(f"'{args.store}': {len(store)} profiles, {store.meta['strings']} distinct strings, {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
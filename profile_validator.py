@@ -0,0 +1,289 @@
+import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import threading
+
+from cv_to_json import create_gemini_payload_config
+from cv_preprocess import DATE_RANGE, GAZETTEER_FILE, LEGAL_ENTITY, load_gazetteer
+from telemetry import count
+
+# --- CONFIGURATION ---
+REPAIR_QUEUE_FILE = "repair_queue.jsonl"
+REPAIR_ATTEMPTS = 1  # extra model calls with the validation errors fed back, before queueing the CV
+SUMMARY_MAX_WORDS = 10
+
+# (min, max) entries per list, as the schema descriptions ask for; keyed by field path ('.' between levels).
+# They are enforced here rather than as min_items/max_items in the response schema.
+ITEM_COUNTS = {"experience": (3, 4), "experience.achievements": (2, 3), "core_strengths": (3, 4)}
+
+# Identifiers the system prompt forbids, beyond what LEGAL_ENTITY and the gazetteer catch
+BRAND_NAMES = re.compile(r"\bbig\s?(?:4|four)\b", re.IGNORECASE)
+PLACEHOLDERS = re.compile(r"\[(?:COMPANY|EMAIL|PHONE|URL)\]")  # left over from cv_preprocess
+# DATE_RANGE is slow to try at every position; strings without a year cannot match it
+YEAR = re.compile(r"(?:19|20)\d{2}")
+
+
+class ProfileInvalid(Exception):
+    """Raised when a parsed profile still breaks the schema or the anonymization rules."""
+
+    def __init__(self, errors: list[str], profile: dict | None = None):
+        super().__init__(f"{len(errors)} validation error{'s' if len(errors) != 1 else ''}: {'; '.join(errors[:3])}")
+        self.errors = errors
+        self.profile = profile
+
+
+def _compile(schema, forbidden: list[tuple[str, re.Pattern, re.Pattern | None]], item_counts: dict, key: str = ""):
+    """
+    Turns one types.Schema node (at field path `key`) into a (normalize, check) pair of closures.
+
+    normalize(value) returns a cleaned copy; check(value, path, errors) appends
+    one message per problem. Walking the schema happens here, once, not per profile.
+    """
+    # types.Type is a str enum, so comparing to its values needs no google.genai import
+    if schema.type == "OBJECT":
+        fields = {name: _compile(sub, forbidden, item_counts, f"{key}.{name}" if key else name)
+                  for name, sub in (schema.properties or {}).items()}
+        required = list(schema.required or [])
+
+        def normalize(value):
+            if not isinstance(value, dict):
+                return value
+            return {name: fields[name][0](item) if name in fields else item for name, item in value.items()}
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path or 'profile'}: expected an object, got {type(value).__name__}")
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}{'.' if path else ''}{name}: missing")
+            for name, (_, check_field) in fields.items():
+                if name in value:
+                    check_field(value[name], f"{path}{'.' if path else ''}{name}", errors)
+        return normalize, check
+
+    if schema.type == "ARRAY":
+        normalize_item, check_item = _compile(schema.items, forbidden, item_counts, key) if schema.items else (None, None)
+        min_items, max_items = item_counts.get(key, (schema.min_items, schema.max_items))
+
+        def normalize(value):
+            if not isinstance(value, list):
+                return value
+            items = [normalize_item(item) if normalize_item else item for item in value]
+            # Extra entries are left for check() to report: the slide has no role_5, so cutting them would lose data
+            return [item for item in items if item not in ("", None, {}, [])]
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected a list, got {type(value).__name__}")
+                return
+            if min_items is not None and len(value) < min_items:
+                errors.append(f"{path}: {len(value)} items, at least {min_items} required")
+            if max_items is not None and len(value) > max_items:
+                errors.append(f"{path}: {len(value)} items, at most {max_items} allowed")
+            if check_item:
+                for i, item in enumerate(value):
+                    check_item(item, f"{path}[{i}]", errors)
+        return normalize, check
+
+    if schema.type == "STRING":
+        def normalize(value):
+            return " ".join(value.split()) if isinstance(value, str) else value
+
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                errors.append(f"{path}: expected a string, got {type(value).__name__}")
+                return
+            if not value:
+                errors.append(f"{path}: empty")
+                return
+            for label, pattern, prefilter in forbidden:
+                if prefilter is not None and not prefilter.search(value):
+                    continue
+                match = pattern.search(value)
+                if match:
+                    errors.append(f"{path}: contains {label} '{match.group(0)}'")
+        return normalize, check
+
+    return (lambda value: value), (lambda value, path, errors: None)
+
+
+class ProfileValidator:
+    """
+    Validator compiled from the response schema in create_gemini_payload_config,
+    so it checks exactly what the model was asked for: required keys and types.
+    On top of the schema it enforces the rules that only live in descriptions
+    and the system prompt: the list counts (ITEM_COUNTS), the summary word cap
+    and no date ranges or company names in any string.
+    """
+
+    def __init__(self, schema=None, gazetteer: re.Pattern | None = None,
+                 summary_max_words: int = SUMMARY_MAX_WORDS, item_counts: dict | None = None):
+        if schema is None:
+            schema = create_gemini_payload_config()[1].response_schema
+        forbidden = [("a date range", DATE_RANGE, YEAR), ("a company name", LEGAL_ENTITY, None),
+                     ("a brand name", BRAND_NAMES, None), ("a placeholder", PLACEHOLDERS, None)]
+        if gazetteer is not None:
+            forbidden.append(("a company name", gazetteer, None))
+        self._normalize, self._check = _compile(schema, forbidden, ITEM_COUNTS if item_counts is None else item_counts)
+        self.summary_max_words = summary_max_words
+
+    def normalize(self, profile: dict) -> dict:
+        """Whitespace collapsed and empty list entries dropped; too-long lists are kept for errors() to report."""
+        return self._normalize(profile)
+
+    def errors(self, profile: dict) -> list[str]:
+        errors = []
+        self._check(profile, "", errors)
+        summary = profile.get("experience_summary") if isinstance(profile, dict) else None
+        if isinstance(summary, str) and len(summary.split()) > self.summary_max_words:
+            errors.append(f"experience_summary: {len(summary.split())} words, at most {self.summary_max_words} allowed")
+        return errors
+
+    def validate(self, profile: dict) -> tuple[dict, list[str]]:
+        """Normalizes, then checks; returns (normalized profile, errors)."""
+        profile = self.normalize(profile)
+        return profile, self.errors(profile)
+
+
+class RepairQueue:
+    """Append-only JSON-lines record of profiles that failed validation, with the errors and the text to re-run."""
+
+    def __init__(self, path: str = REPAIR_QUEUE_FILE):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, source: str, profile, errors: list[str], cv_text: str | None = None):
+        entry = {"source": source, "errors": errors, "profile": profile,
+                 "queued_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        if cv_text is not None:
+            entry["cv_text"] = cv_text
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.count += 1
+
+
+def repair_prompt(cv_text: str, errors: list[str]) -> str:
+    """The CV again, prefixed with what was wrong with the previous extraction."""
+    problems = "\n".join(f"- {error}" for error in errors)
+    return f"[A previous extraction of this CV was rejected for these problems; avoid them]\n{problems}\n\n{cv_text}"
+
+
+class ValidatingBackend:
+    """
+    Wraps a backend (see cv_batch) so only valid, normalized profiles come out.
+
+    An invalid profile is re-requested up to `repair_attempts` times with the
+    errors fed back to the model; if it is still invalid it goes to the repair
+    queue and ProfileInvalid is raised, failing that CV but not the batch.
+    """
+
+    def __init__(self, backend, validator: ProfileValidator, repair_queue: RepairQueue | None = None,
+                 repair_attempts: int = REPAIR_ATTEMPTS):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.system_prompt, self.config = backend.system_prompt, backend.config
+        self.validator = validator
+        self.repair_queue = repair_queue
+        self.repair_attempts = repair_attempts
+        self.repaired = 0
+        self._lock = threading.Lock()
+
+    def parse(self, cv_text: str) -> dict:
+        profile, errors = self.validator.validate(self.backend.parse(cv_text))
+        # Repairs go out in one piece even under ChunkedBackend, so the model sees the errors with the whole CV
+        parse_whole = getattr(self.backend, "parse_unchunked", self.backend.parse)
+        for _ in range(self.repair_attempts):
+            if not errors:
+                break
+            count("profile_repairs_total")
+            profile, errors = self.validator.validate(parse_whole(repair_prompt(cv_text, errors)))
+            if not errors:
+                with self._lock:
+                    self.repaired += 1
+        count("profiles_validated_total", result="invalid" if errors else "valid")
+        if errors:
+            if self.repair_queue is not None:
+                source = "sha256:" + hashlib.sha256(cv_text.encode("utf-8")).hexdigest()
+                self.repair_queue.record(source, profile, errors, cv_text)
+            raise ProfileInvalid(errors, profile)
+        return profile
+
+
+def collect_profile_files(paths: list[str]) -> list[str]:
+    """Expands directories to the *.json files inside them."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json"))
+        else:
+            files.append(path)
+    return files
+
+
+def validate_files(validator: ProfileValidator, paths: list[str], repair_queue: RepairQueue | None = None,
+                   fix: bool = False) -> dict:
+    """
+    Validates profile JSON files (a file may hold one profile or a list of them).
+
+    Invalid profiles go to `repair_queue`; with `fix`, valid ones are written back normalized
+    and invalid ones are left as they were.
+    """
+    counts = {"valid": 0, "invalid": 0, "unreadable": 0}
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {type(e).__name__}: {e}")
+            counts["unreadable"] += 1
+            continue
+        profiles = data if isinstance(data, list) else [data]
+        normalized = []
+        for i, original in enumerate(profiles):
+            profile, errors = validator.validate(original)
+            normalized.append(original if errors else profile)
+            if errors:
+                counts["invalid"] += 1
+                source = f"{path}[{i}]" if isinstance(data, list) else path
+                print(f"⚠️ {source}: {'; '.join(errors)}")
+                if repair_queue is not None:
+                    repair_queue.record(source, profile, errors)
+            else:
+                counts["valid"] += 1
+        if fix and normalized != profiles:
+            with open(path, 'w') as f:
+                f.write(json.dumps(normalized if isinstance(data, list) else normalized[0], indent=4))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parsed profiles against the response schema and anonymization rules.")
+    parser.add_argument("paths", nargs="+", help="Profile JSON files or directories of them")
+    parser.add_argument("--gazetteer", default=GAZETTEER_FILE, help="Company names that must not appear")
+    parser.add_argument("--repair-queue", default=REPAIR_QUEUE_FILE, help="JSON-lines file for invalid profiles")
+    parser.add_argument("--fix", action="store_true", help="Write valid profiles back to their files normalized")
+    args = parser.parse_args()
+
+    validator = ProfileValidator(gazetteer=load_gazetteer(args.gazetteer))
+    repair_queue = RepairQueue(args.repair_queue)
+    files = collect_profile_files(args.paths)
+
+    print(f"--- 🔎 Validating {len(files)} profile files ---")
+    start = time.perf_counter()
+    counts = validate_files(validator, files, repair_queue, args.fix)
+    elapsed = time.perf_counter() - start
+    total = counts["valid"] + counts["invalid"]
+    print(f"\n{counts['valid']}/{total} profiles valid, {counts['unreadable']} unreadable files "
+          f"({total / elapsed if elapsed else 0:.0f} profiles/s).")
+    if repair_queue.count:
+        print(f"⚠️ {repair_queue.count} invalid profiles were written to '{repair_queue.path}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from json_to_pptx import MAX_SLIDES_PER_DECK, TEMPLATE_FILE, CompiledTemplate, render_deck
+
+# --- CONFIGURATION ---
+OUTPUT_DIR = "decks"
+CHUNK_SIZE = 16  # profiles per task sent to a worker
+
+_template = None  # per-process CompiledTemplate, set by _init_worker
+
+
+def _init_worker(template_file: str):
+    global _template
+    _template = CompiledTemplate(template_file)
+
+
+def _render_chunk(jobs: list[tuple[str, str]]) -> list[dict]:
+    """Renders a shard of (json_path, output_path) jobs; one bad profile never sinks the rest."""
+    results = []
+    for json_path, output_path in jobs:
+        start = time.perf_counter()
+        error = None
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            _template.render(data, output_path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append({
+            "json_path": json_path,
+            "output_path": output_path,
+            "seconds": round(time.perf_counter() - start, 4),
+            "error": error,
+        })
+    return results
+
+
+def collect_json_files(source: str) -> list[str]:
+    if os.path.isdir(source):
+        return [os.path.join(source, name) for name in sorted(os.listdir(source)) if name.endswith(".json")]
+    return [source]
+
+
+def render_batch(json_paths: list[str], output_dir: str = OUTPUT_DIR, workers: int | None = None,
+                 chunk_size: int = CHUNK_SIZE, template_file: str = TEMPLATE_FILE) -> list[dict]:
+    """
+    Renders every profile JSON to <output_dir>/<stem>.pptx across a process pool.
+
+    Each worker process compiles the template once at startup. Returns one result
+    dict per profile (json_path, output_path, seconds, error) in completion order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".pptx"))
+            for path in json_paths]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template_file,)) as pool:
+        futures = [pool.submit(_render_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                results.append(result)
+                if result["error"]:
+                    print(f"❌ {result['json_path']}: {result['error']}")
+    return results
+
+
+def iter_profiles(json_paths: list[str], failures: list[dict]):
+    """
+    Loads (path, profile) pairs one at a time, so a deck build never holds them all.
+
+    Unreadable files are skipped and appended to `failures` as {"name", "error"}.
+    """
+    for path in json_paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            failures.append({"name": path, "error": f"{type(e).__name__}: {e}"})
+            continue
+        yield path, data
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    timings = sorted(r["seconds"] for r in results if not r["error"])
+    return {
+        "profiles": len(results),
+        "failed": sum(1 for r in results if r["error"]),
+        "elapsed_seconds": round(elapsed, 3),
+        "profiles_per_second": round(len(results) / elapsed, 2) if elapsed else None,
+        "mean_seconds": round(sum(timings) / len(timings), 4) if timings else None,
+        "p95_seconds": timings[int(0.95 * (len(timings) - 1))] if timings else None,
+        "max_seconds": timings[-1] if timings else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render many profile JSONs to PPTX on all CPU cores, or into one deck.")
+    parser.add_argument("source", help="A profile JSON file or a directory of them")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--template", default=TEMPLATE_FILE)
+    parser.add_argument("--report", help="Write per-profile timings and failures to this JSON file")
+    parser.add_argument("--deck", help="Instead of one file per profile, write every profile as a slide of this one deck")
+    parser.add_argument("--max-slides", type=int, default=MAX_SLIDES_PER_DECK, help="Split --deck into parts beyond this many slides")
+    args = parser.parse_args()
+
+    json_paths = collect_json_files(args.source)
+    if args.deck:
+        print(f"--- 🗂️ Building one deck from {len(json_paths)} profiles ---")
+        start = time.perf_counter()
+        unreadable = []
+        try:
+            written, failures = render_deck(iter_profiles(json_paths, unreadable), args.deck, args.template, args.max_slides)
+        except ValueError as e:
+            raise SystemExit(f"Error: {e} in '{args.source}'.")
+        failures = unreadable + failures
+        for failure in failures:
+            print(f"❌ {failure['name']}: {failure['error']}")
+        print(f"Wrote {len(json_paths) - len(failures)} slides to {', '.join(written)} in "
+              f"{time.perf_counter() - start:.2f}s; {len(failures)} profiles failed.")
+        return
+    print(f"--- 🖨️ Rendering {len(json_paths)} profiles with {args.workers or os.cpu_count()} workers ---")
+    start = time.perf_counter()
+    results = render_batch(json_paths, args.output_dir, args.workers, args.chunk_size, args.template)
+    summary = summarize(results, time.perf_counter() - start)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(json.dumps({"summary": summary, "profiles": results}, indent=4))
+
+    print("\n" + "="*50)
+    print(f"Rendered {summary['profiles'] - summary['failed']}/{summary['profiles']} profiles in "
+          f"{summary['elapsed_seconds']}s ({summary['profiles_per_second']}/s), "
+          f"mean {summary['mean_seconds']}s, p95 {summary['p95_seconds']}s per profile.")
+    print(f"Decks written to '{args.output_dir}'.")
+
+
+if __name__ == "__main__":
+    main()
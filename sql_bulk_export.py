@@ -0,0 +1,172 @@
+import os
+import csv
+import sqlite3
+import argparse
+
+from json_to_sql import escape_sql, executive_row, highlight_rows, strength_rows
+from db_loader import iter_profiles
+
+# --- CONFIGURATION ---
+BATCH_SIZE = 500  # rows per multi-row INSERT
+SQL_OUTPUT_FILE = "bulk_output.sql"
+CSV_OUTPUT_DIR = "bulk_csv"
+
+TABLE_COLUMNS = {
+    "executives": ("id", "title", "gender", "experience", "sector_focus", "location"),
+    "executive_highlights": ("id", "executive_id", "position_title", "company_description", "details", "display_order"),
+    "executive_strengths": ("id", "executive_id", "strength_description", "display_order"),
+}
+
+
+def start_ids(start_id: int | dict = 1) -> dict:
+    """Per-table first surrogate id: one number for every table, or a {table: id} dict."""
+    return dict(start_id) if isinstance(start_id, dict) else {table: start_id for table in TABLE_COLUMNS}
+
+
+def next_ids_from_database(database: str) -> dict:
+    """MAX(id) + 1 of every table in an existing SQLite target, so an export appends without key collisions."""
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return {table: conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+                for table in TABLE_COLUMNS}
+    finally:
+        conn.close()
+
+
+def iter_rows(profiles, start_id: int | dict = 1):
+    """
+    Yields (table, row) for every profile, each executive row followed by its children.
+
+    Every table gets its own surrogate id sequence starting at `start_id` (one
+    number, or a {table: id} dict), assigned in input order, so the same input
+    always exports the same keys.
+    """
+    next_id = start_ids(start_id)
+    for data in profiles:
+        executive_id = next_id["executives"]
+        next_id["executives"] += 1
+        yield "executives", (executive_id,) + executive_row(data)
+        for table, rows in (("executive_highlights", highlight_rows(data, executive_id)),
+                            ("executive_strengths", strength_rows(data, executive_id))):
+            for row in rows:
+                yield table, (next_id[table],) + row
+                next_id[table] += 1
+
+
+def sql_literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return f"'{escape_sql(value)}'"
+
+
+def write_multirow_sql(profiles, out, batch_size: int = BATCH_SIZE, start_id: int | dict = 1) -> int:
+    """
+    Streams profiles to `out` as multi-row INSERT ... VALUES statements of up to `batch_size` rows.
+
+    At most one pending batch per table is held in memory. Executives are always
+    flushed before any child rows that point at them. Returns the number of profiles written.
+    """
+    pending = {table: [] for table in TABLE_COLUMNS}
+
+    def flush(table):
+        rows = pending[table]
+        if not rows:
+            return
+        if table != "executives":
+            flush("executives")
+        out.write(f"INSERT INTO {table} ({', '.join(TABLE_COLUMNS[table])}) VALUES\n")
+        out.write(",\n".join("(" + ", ".join(sql_literal(v) for v in row) + ")" for row in rows))
+        out.write(";\n\n")
+        pending[table] = []
+
+    count = 0
+    out.write("BEGIN;\n\n")
+    for table, row in iter_rows(profiles, start_id):
+        if table == "executives":
+            count += 1
+        pending[table].append(row)
+        if len(pending[table]) >= batch_size:
+            flush(table)
+    for table in TABLE_COLUMNS:
+        flush(table)
+    out.write("COMMIT;\n")
+    return count
+
+
+def write_copy_csv(profiles, output_dir: str = CSV_OUTPUT_DIR, start_id: int | dict = 1) -> int:
+    """
+    Streams profiles into one CSV per table plus a load.sql with the matching COPY commands.
+
+    load.sql (for psql) runs in one transaction: it first refuses to load into a
+    table whose ids already reach the exported ones, and after the copies moves
+    each SERIAL sequence past the loaded ids, since COPY with explicit ids does
+    not. Returns the number of profiles written.
+    """
+    first_ids = start_ids(start_id)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {table: open(os.path.join(output_dir, table + ".csv"), 'w', newline='', encoding='utf-8')
+             for table in TABLE_COLUMNS}
+    try:
+        writers = {table: csv.writer(f) for table, f in files.items()}
+        for table, writer in writers.items():
+            writer.writerow(TABLE_COLUMNS[table])
+        count = 0
+        for table, row in iter_rows(profiles, start_id):
+            if table == "executives":
+                count += 1
+            writers[table].writerow(row)
+    finally:
+        for f in files.values():
+            f.close()
+
+    with open(os.path.join(output_dir, "load.sql"), 'w') as f:
+        f.write("\\set ON_ERROR_STOP on\nBEGIN;\n\n")
+        f.write("DO $$\nBEGIN\n")
+        for table in TABLE_COLUMNS:
+            f.write(f"    IF (SELECT COALESCE(MAX(id), 0) FROM {table}) >= {first_ids[table]} THEN\n"
+                    f"        RAISE EXCEPTION '{table} already has ids from {first_ids[table]} up; re-export with a higher --start-id';\n"
+                    f"    END IF;\n")
+        f.write("END $$;\n\n")
+        # Parents first so the foreign keys resolve
+        for table, columns in TABLE_COLUMNS.items():
+            f.write(f"\\copy {table} ({', '.join(columns)}) FROM '{table}.csv' WITH (FORMAT csv, HEADER true);\n")
+        f.write("\n")
+        for table in TABLE_COLUMNS:
+            f.write(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}));\n")
+        f.write("\nCOMMIT;\n")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export many profiles as multi-row SQL or per-table CSV for COPY.")
+    parser.add_argument("source", help="A profile JSON file (object or list) or a directory of them")
+    parser.add_argument("--format", choices=["sql", "csv"], default="sql")
+    parser.add_argument("--output", help=f"SQL file (default {SQL_OUTPUT_FILE}) or CSV directory (default {CSV_OUTPUT_DIR})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ids = parser.add_mutually_exclusive_group()
+    ids.add_argument("--start-id", type=int, help="First surrogate key for every table (default 1)")
+    ids.add_argument("--database", help="SQLite target to append to: each table's keys continue after its MAX(id)")
+    args = parser.parse_args()
+
+    if args.database:
+        if not os.path.exists(args.database):
+            raise SystemExit(f"Error: database '{args.database}' not found.")
+        start_id = next_ids_from_database(args.database)
+    else:
+        start_id = args.start_id or 1
+    profiles = iter_profiles(args.source)
+    if args.format == "sql":
+        output = args.output or SQL_OUTPUT_FILE
+        with open(output, 'w', encoding='utf-8') as f:
+            count = write_multirow_sql(profiles, f, args.batch_size, start_id)
+    else:
+        output = args.output or CSV_OUTPUT_DIR
+        count = write_copy_csv(profiles, output, start_id)
+
+    print(f"--- 📦 Exported {count} profiles to '{output}' ({args.format}) ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import queue
+import asyncio
+import hashlib
+import sqlite3
+import argparse
+import itertools
+import threading
+import contextlib
+import uuid
+
+from json_to_sql import executive_row, highlight_rows, strength_rows
+from db_loader import DATABASE_FILE, create_schema, insert_sql
+from profile_store import ProfileStore, is_store, iter_json_profiles
+from telemetry import count, span
+
+# --- CONFIGURATION ---
+POOL_SIZE = 4
+BATCH_SIZE = 500  # profiles per transaction
+FLUSH_SECONDS = 0.05  # a partial batch is committed after waiting this long for more profiles
+BUSY_TIMEOUT_SECONDS = 30.0
+
+EXECUTIVE_COLUMNS = ("title", "gender", "experience", "sector_focus", "location")
+
+
+def source_key(source: str) -> str:
+    """Natural key from where a profile came from (a CV hash, path or profile id): re-parses update in place."""
+    return hashlib.sha256(f"source:{source}".encode("utf-8")).hexdigest()
+
+
+def content_hash(data: dict) -> str:
+    """Hash of the profile itself, key order and whitespace aside."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def ensure_ingest_schema(conn):
+    """The executives schema plus the natural-key columns, added in place to databases created before them."""
+    create_schema(conn)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(executives)")}
+    for column in ("source_key", "content_hash"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE executives ADD COLUMN {column} TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_executives_source_key ON executives(source_key)")
+    conn.commit()
+
+
+def upsert_sql(placeholder: str = "?") -> str:
+    """INSERT ... ON CONFLICT DO UPDATE keyed on source_key (SQLite 3.35+ and PostgreSQL)."""
+    p = placeholder
+    columns = ", ".join(EXECUTIVE_COLUMNS)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in EXECUTIVE_COLUMNS + ("content_hash",))
+    return (f"INSERT INTO executives (source_key, content_hash, {columns}) VALUES ({', '.join([p] * 7)}) "
+            f"ON CONFLICT (source_key) DO UPDATE SET {updates} RETURNING id")
+
+
+def upsert_batch(conn, items: list[tuple[str, dict]], placeholder: str = "?") -> list[tuple[int, str]]:
+    """
+    Upserts (key, profile) pairs in one transaction; returns (executive_id, status) per item.
+
+    status is 'inserted', 'updated' or 'unchanged'. Unchanged profiles (same key,
+    same content hash) are not touched. For changed ones the executives row is
+    updated in place and its highlights and strengths are deleted and re-inserted
+    in the same transaction, so readers never see a half-replaced profile.
+    A key repeated within the batch resolves to its last profile; the first
+    occurrence gets the key's status and the others 'duplicate', so the counts
+    match the rows.
+    """
+    p = placeholder
+    latest = {key: data for key, data in items}
+    hashes = {key: content_hash(data) for key, data in latest.items()}
+    cursor = conn.cursor()
+    try:
+        existing = {}
+        keys = list(latest)
+        for i in range(0, len(keys), 500):  # stay under the bound-parameter limit
+            chunk = keys[i:i + 500]
+            cursor.execute(f"SELECT source_key, id, content_hash FROM executives WHERE source_key IN ({', '.join([p] * len(chunk))})",
+                           chunk)
+            existing.update({key: (executive_id, digest) for key, executive_id, digest in cursor.fetchall()})
+
+        results, upserted, highlights, strengths = {}, [], [], []
+        upsert = upsert_sql(p)
+        for key, data in latest.items():
+            found = existing.get(key)
+            if found and found[1] == hashes[key]:
+                results[key] = (found[0], "unchanged")
+                continue
+            cursor.execute(upsert, (key, hashes[key]) + executive_row(data))
+            executive_id = cursor.fetchone()[0]
+            results[key] = (executive_id, "updated" if found else "inserted")
+            upserted.append(executive_id)
+            highlights.extend(highlight_rows(data, executive_id))
+            strengths.extend(strength_rows(data, executive_id))
+
+        # Every upserted id, not just the keys seen above: another writer may have inserted one since that read
+        for table in ("executive_highlights", "executive_strengths"):
+            cursor.executemany(f"DELETE FROM {table} WHERE executive_id = {p}", [(i,) for i in upserted])
+        _, highlights_sql, strengths_sql = insert_sql(p)
+        cursor.executemany(highlights_sql, highlights)
+        cursor.executemany(strengths_sql, strengths)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    statuses, seen = [], set()
+    for key, _ in items:
+        executive_id, status = results[key]
+        statuses.append((executive_id, "duplicate" if key in seen else status))
+        seen.add(key)
+    return statuses
+
+
+class ConnectionPool:
+    """
+    A fixed set of DB-API connections, handed out one per batch and returned after it.
+
+    With `serialize_writes` only one batch commits at a time, for databases with
+    a single writer (SQLite) where concurrent transactions would fail on the lock
+    rather than wait for it.
+    """
+
+    def __init__(self, factory, size: int = POOL_SIZE, serialize_writes: bool = False):
+        self._idle = queue.Queue()
+        self.size = size
+        self.write_lock = threading.Lock() if serialize_writes else contextlib.nullcontext()
+        for _ in range(size):
+            self._idle.put(factory())
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, conn):
+        self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+def sqlite_pool(database: str = DATABASE_FILE, size: int = POOL_SIZE) -> ConnectionPool:
+    """
+    A pool over a SQLite file in WAL mode (readers never block the writer);
+    batches run one at a time.
+
+    ':memory:' gives a shared-cache in-memory database instead, as a throwaway
+    stand-in for a server database.
+    """
+    if database == ":memory:":
+        uri, kwargs = f"file:ingest-{uuid.uuid4().hex}?mode=memory&cache=shared", {"uri": True}
+    else:
+        uri, kwargs = database, {}
+
+    def connect():
+        conn = sqlite3.connect(uri, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False, **kwargs)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if database != ":memory:":
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    pool = ConnectionPool(connect, size, serialize_writes=True)
+    conn = pool.acquire()
+    try:
+        ensure_ingest_schema(conn)
+    finally:
+        pool.release(conn)
+    return pool
+
+
+class IngestService:
+    """
+    Async front end over upsert_batch.
+
+    `await ingest(key, profile)` queues the profile and resolves to its
+    (executive_id, status) once its batch commits. A background task groups
+    queued profiles into batches of up to `batch_size` (or whatever arrived
+    within `flush_seconds`), and runs each batch on a pooled connection in a
+    worker thread, up to one batch in flight per connection.
+    """
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = BATCH_SIZE, flush_seconds: float = FLUSH_SECONDS,
+                 placeholder: str = "?"):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.placeholder = placeholder
+        self.counts = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicate": 0, "failed": 0}
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._in_flight = set()
+
+    async def __aenter__(self):
+        self._queue = asyncio.Queue(maxsize=self.batch_size * self.pool.size * 2)
+        self._slots = asyncio.Semaphore(self.pool.size)
+        self._batcher = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._queue.put(None)
+        await self._batcher
+        await asyncio.gather(*self._in_flight)
+
+    async def ingest(self, key: str, data: dict) -> tuple[int, str]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, data, future))
+        return await future
+
+    async def _run(self):
+        done = False
+        while not done:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = asyncio.get_running_loop().time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            await self._slots.acquire()
+            task = asyncio.create_task(self._commit(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _commit(self, batch: list[tuple]):
+        try:
+            results = await asyncio.to_thread(self._commit_sync, [(key, data) for key, data, _ in batch])
+        except Exception as e:
+            self.counts["failed"] += len(batch)
+            count("sql_ingest_profiles_total", len(batch), status="failed")
+            for _, _, future in batch:
+                future.set_exception(e)
+        else:
+            for (_, _, future), (executive_id, status) in zip(batch, results):
+                self.counts[status] += 1
+                future.set_result((executive_id, status))
+            for status in ("inserted", "updated", "unchanged", "duplicate"):
+                n = sum(1 for _, s in results if s == status)
+                if n:
+                    count("sql_ingest_profiles_total", n, status=status)
+        finally:
+            self._slots.release()
+
+    def _commit_sync(self, items):
+        conn = self.pool.acquire()
+        try:
+            with self.pool.write_lock, span("sql.ingest_batch", profiles=len(items)):
+                return upsert_batch(conn, items, self.placeholder)
+        finally:
+            self.pool.release(conn)
+
+
+def iter_named_profiles(source: str):
+    """(name, profile) pairs from a profile store, a directory of JSON files, or one JSON file (object or list)."""
+    if is_store(source):
+        with ProfileStore(source) as store:
+            yield from zip(store.ids, store)
+    elif os.path.isdir(source):
+        yield from iter_json_profiles(source)
+    else:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            yield from ((f"{stem}[{i}]", profile) for i, profile in enumerate(data))
+        else:
+            yield stem, data
+
+
+async def ingest_all(service: IngestService, named_profiles, key_by: str = "source") -> list:
+    """
+    Feeds every profile through the service; returns (executive_id, status) or the exception, per profile.
+
+    Profiles are read from `named_profiles` one window (a batch per pooled
+    connection) at a time, so only that many sit in memory.
+    """
+    def key(name, data):
+        return source_key(name) if key_by == "source" else content_hash(data)
+
+    results = []
+    window = service.batch_size * service.pool.size
+    named_profiles = iter(named_profiles)
+    while True:
+        chunk = list(itertools.islice(named_profiles, window))
+        if not chunk:
+            return results
+        results.extend(await asyncio.gather(*(service.ingest(key(name, data), data) for name, data in chunk),
+                                            return_exceptions=True))
+
+
+async def _main(args):
+    pool = sqlite_pool(args.database, args.pool_size)
+    try:
+        async with IngestService(pool, args.batch_size) as service:
+            results = await ingest_all(service, iter_named_profiles(args.source), args.key_by)
+    finally:
+        pool.close()
+    return service, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idempotently upsert profiles into the executives database.")
+    parser.add_argument("source", help="A profile store, a directory of profile JSONs, or one JSON file")
+    parser.add_argument("--database", default=DATABASE_FILE, help="SQLite database file (':memory:' for a dry run)")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--key-by", choices=("source", "content"), default="source",
+                        help="Natural key: the profile's name/file stem (re-parses update) or its content hash")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    service, results = asyncio.run(_main(args))
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, Exception)]
+
+    c = service.counts
+    print(f"--- 🔁 Ingested {len(results)} profiles into '{args.database}' in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.0f} profiles/s) ---")
+    print(f"{c['inserted']} inserted, {c['updated']} updated, {c['unchanged']} unchanged, "
+          f"{c['duplicate']} duplicates, {c['failed']} failed.")
+    for error in errors[:5]:
+        print(f"❌ {type(error).__name__}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import pstats
+import cProfile
+import functools
+import itertools
+import threading
+from contextlib import contextmanager
+
+# --- CONFIGURATION ---
+METRIC_PREFIX = "fraxen_"
+# Upper bounds (seconds) of the span duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+PROFILE_TOP_N = 25
+
+
+class Telemetry:
+    """
+    In-process spans and counters.
+
+    Every span updates a per-name duration histogram and error count; when a
+    trace file is configured each finished span is also written to it as one
+    JSON line, with its parent span so a run can be read back as a tree.
+    Counters are labelled totals (tokens used, cache hits, retries...).
+    Thread-safe; one instance per process (see the module-level helpers).
+    """
+
+    def __init__(self):
+        self.trace_path = None
+        self._trace_file = None
+        self.counters = {}  # (name, sorted label items) -> value
+        self.spans = {}  # name -> {"count", "errors", "sum", "buckets"}
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def configure(self, trace_path: str | None = None):
+        self.close()
+        self.trace_path = trace_path
+        if trace_path:
+            os.makedirs(os.path.dirname(trace_path) or ".", exist_ok=True)
+            self._trace_file = open(trace_path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+
+    def count(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def span(self, name: str, **attributes) -> "Span":
+        """Times a with-block; attributes set on the span while it runs end up in its trace line."""
+        return Span(self, name, attributes)
+
+    def _finish(self, name, span_id, parent_id, start_wall, seconds, error, attributes):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = {"count": 0, "errors": 0, "sum": 0.0, "buckets": [0] * len(DURATION_BUCKETS)}
+            stats["count"] += 1
+            stats["sum"] += seconds
+            stats["errors"] += error is not None
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+                    break
+            if self._trace_file is not None:
+                record = {"span": name, "id": span_id, "parent": parent_id, "thread": threading.current_thread().name,
+                          "start": round(start_wall, 6), "seconds": round(seconds, 6), "error": error}
+                if attributes:
+                    record["attributes"] = attributes
+                self._trace_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def prometheus_text(self) -> str:
+        """Everything recorded so far in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            spans = {name: dict(stats, buckets=list(stats["buckets"])) for name, stats in sorted(self.spans.items())}
+
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+            for (counter, labels), value in counters:
+                if counter == name:
+                    lines.append(f"{METRIC_PREFIX}{name}{_labels(dict(labels))} {value}")
+
+        if spans:
+            metric = f"{METRIC_PREFIX}span_duration_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in spans.items():
+                cumulative = 0
+                for bound, n in zip(DURATION_BUCKETS, stats["buckets"]):
+                    cumulative += n
+                    lines.append(f"{metric}_bucket{_labels({'span': name, 'le': bound})} {cumulative}")
+                lines.append(f"{metric}_bucket{_labels({'span': name, 'le': '+Inf'})} {stats['count']}")
+                lines.append(f"{metric}_sum{_labels({'span': name})} {stats['sum']:.6f}")
+                lines.append(f"{metric}_count{_labels({'span': name})} {stats['count']}")
+            lines.append(f"# TYPE {METRIC_PREFIX}span_errors_total counter")
+            for name, stats in spans.items():
+                lines.append(f"{METRIC_PREFIX}span_errors_total{_labels({'span': name})} {stats['errors']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically replaces `path`, so a textfile collector never reads a half-written file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def summary(self) -> list[dict]:
+        with self._lock:
+            return [{"span": name, "count": s["count"], "errors": s["errors"], "seconds": round(s["sum"], 4),
+                     "mean_ms": round(s["sum"] * 1000 / s["count"], 3) if s["count"] else 0.0}
+                    for name, s in sorted(self.spans.items(), key=lambda item: -item[1]["sum"])]
+
+
+class Span:
+    """One timed block (see Telemetry.span); a plain class because this sits on hot paths."""
+
+    __slots__ = ("telemetry", "name", "attributes", "span_id", "parent_id", "start_wall", "start")
+
+    def __init__(self, telemetry: Telemetry, name: str, attributes: dict):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        local = self.telemetry._local
+        stack = local.stack if hasattr(local, "stack") else local.__dict__.setdefault("stack", [])
+        self.span_id = next(self.telemetry._ids)
+        self.parent_id = stack[-1] if stack else None
+        stack.append(self.span_id)
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.telemetry._local.stack.pop()
+        error = f"{exc_type.__name__}: {exc}" if exc_type is not None else None
+        self.telemetry._finish(self.name, self.span_id, self.parent_id, self.start_wall, seconds, error, self.attributes)
+        return False
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+TELEMETRY = Telemetry()
+span = TELEMETRY.span
+count = TELEMETRY.count
+
+
+def traced(name: str):
+    """Decorator form of span(), for functions whose every call should be timed."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with TELEMETRY.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profiled(path: str | None):
+    """Runs the block under cProfile when `path` is set; saves the stats there and prints the hottest functions."""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"\n--- 🔥 Profile saved to '{path}' (top {PROFILE_TOP_N} by cumulative time) ---")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+
+
+def add_telemetry_arguments(parser):
+    parser.add_argument("--trace-log", help="Append every timing span to this JSON-lines file")
+    parser.add_argument("--metrics-file", help="Write counters and span histograms here in Prometheus text format")
+    parser.add_argument("--profile", help="Run under cProfile and save the stats to this file")
+
+
+@contextmanager
+def instrumented_run(args, name: str):
+    """Wraps a whole CLI run: one root span, the optional profiler, and the metrics file written at the end."""
+    TELEMETRY.configure(args.trace_log)
+    try:
+        with profiled(args.profile), TELEMETRY.span(name):
+            yield TELEMETRY
+    finally:
+        if args.metrics_file:
+            TELEMETRY.write_prometheus(args.metrics_file)
+            print(f"📈 Metrics written to '{args.metrics_file}'.")
+        TELEMETRY.close()
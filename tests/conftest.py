@@ -0,0 +1,18 @@
+import os
+import sys
+import json
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules are flat scripts at the repository root, not a package
+sys.path.insert(0, ROOT)
+
+SAMPLE_PROFILE_FILE = os.path.join(ROOT, "json_output.json")
+
+
+@pytest.fixture
+def profile():
+    """The sample parsed profile that ships with the repo (also the stub backend's answer)."""
+    with open(SAMPLE_PROFILE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
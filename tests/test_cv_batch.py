@@ -0,0 +1,38 @@
+import json
+
+from conftest import SAMPLE_PROFILE_FILE
+from cv_batch import StubBackend, run_batch
+from gemini_scheduler import DeadLetterFile
+
+
+def write_cvs(directory, names):
+    paths = []
+    for name in names:
+        path = directory / f"{name}.txt"
+        path.write_text(f"CV of {name}", encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_run_batch_writes_one_json_per_cv(tmp_path, profile):
+    cv_paths = write_cvs(tmp_path, ["alice", "bob", "carol"])
+    output_dir = tmp_path / "out"
+
+    results = run_batch(StubBackend(SAMPLE_PROFILE_FILE), cv_paths, str(output_dir), concurrency=2)
+
+    assert [r.cv_path for r in results] == cv_paths
+    assert all(r.error is None for r in results)
+    for name in ("alice", "bob", "carol"):
+        assert json.loads((output_dir / f"{name}.json").read_text()) == profile
+
+
+def test_run_batch_records_failures_without_stopping(tmp_path):
+    cv_paths = write_cvs(tmp_path, ["ok"]) + [str(tmp_path / "missing.txt")]
+    dead_letter = DeadLetterFile(str(tmp_path / "dead_letter.jsonl"))
+
+    results = run_batch(StubBackend(SAMPLE_PROFILE_FILE), cv_paths, str(tmp_path / "out"), dead_letter=dead_letter)
+
+    assert results[0].error is None
+    assert results[1].error.startswith("FileNotFoundError")
+    entries = [json.loads(line) for line in (tmp_path / "dead_letter.jsonl").read_text().splitlines()]
+    assert [e["cv_path"] for e in entries] == [cv_paths[1]]
@@ -0,0 +1,65 @@
+from cv_chunked import ChunkedBackend
+from cv_to_json import create_gemini_payload_config
+from profile_validator import ProfileValidator, ValidatingBackend
+
+
+class RecordingBackend:
+    """Answers each part with one role named after it and remembers which schema it was asked for."""
+
+    def __init__(self, profile):
+        self.model_name = "recording"
+        self.system_prompt, self.config = create_gemini_payload_config()
+        self.profile = profile
+        self.calls = []
+
+    def parse(self, cv_text, timeout=None, config=None):
+        fields = list((config or self.config).response_schema.properties)
+        self.calls.append((cv_text, fields))
+        if config is None:
+            return dict(self.profile)
+        part = cv_text.split("]")[0]
+        answer = {"experience": [{"job_title": part, "description": part, "achievements": ["Grew revenue 10%"]}],
+                  "core_strengths": ["Strategy"]}
+        if "title" in fields:
+            answer.update({name: self.profile[name] for name in ("title", "gender", "experience_summary",
+                                                                  "sector_focus", "location")})
+        return answer
+
+
+def long_cv(sections):
+    return "\n".join(f"SECTION {i}:\n" + "x" * 900 for i in range(sections))
+
+
+def test_chunks_use_the_part_schema_and_header_scalars(profile):
+    inner = RecordingBackend(profile)
+    merged = ChunkedBackend(inner, long_cv_chars=1000, chunk_chars=1000).parse(long_cv(4))
+
+    schemas = sorted(fields for _, fields in inner.calls)
+    assert schemas[0] == ["experience", "core_strengths"]
+    assert sum("title" in fields for fields in schemas) == 1
+    assert merged["title"] == profile["title"]
+    assert len(merged["experience"]) == 4
+
+
+def test_too_few_roles_falls_back_to_one_call(profile):
+    inner = RecordingBackend(profile)
+    merged = ChunkedBackend(inner, long_cv_chars=1000, chunk_chars=1000).parse(long_cv(2))
+
+    assert len(inner.calls) == 3
+    assert inner.calls[-1][1] == list(inner.config.response_schema.properties)
+    assert merged == profile
+
+
+def test_repair_prompts_are_not_chunked(profile):
+    inner = RecordingBackend(profile)
+    backend = ValidatingBackend(ChunkedBackend(inner, long_cv_chars=1000, chunk_chars=1000), ProfileValidator(),
+                                repair_attempts=1)
+    cv_text = long_cv(4)
+
+    # The merged chunks have one achievement per role, too few to validate
+    assert backend.parse(cv_text) == profile
+
+    repair_text, fields = inner.calls[-1]
+    assert repair_text.startswith("[A previous extraction")
+    assert repair_text.endswith(cv_text)
+    assert fields == list(inner.config.response_schema.properties)
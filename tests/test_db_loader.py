@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+from db_loader import create_schema, load_batch, load_profiles
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    yield conn
+    conn.close()
+
+
+def row_count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_load_batch_inserts_profile_and_children(conn, profile):
+    ids = load_batch(conn, [profile, profile])
+
+    assert len(ids) == 2 and len(set(ids)) == 2
+    assert row_count(conn, "executives") == 2
+    assert row_count(conn, "executive_highlights") == 2 * len(profile["experience"])
+    assert row_count(conn, "executive_strengths") == 2 * len(profile["core_strengths"])
+    orders = conn.execute("SELECT display_order FROM executive_strengths WHERE executive_id = ? ORDER BY id",
+                          (ids[0],)).fetchall()
+    assert [o for (o,) in orders] == list(range(1, len(profile["core_strengths"]) + 1))
+
+
+def test_load_batch_rolls_back_the_whole_batch(conn, profile):
+    broken = dict(profile)
+    del broken["title"]
+
+    with pytest.raises(KeyError):
+        load_batch(conn, [profile, broken])
+
+    for table in ("executives", "executive_highlights", "executive_strengths"):
+        assert row_count(conn, table) == 0
+
+
+def test_load_profiles_splits_into_batches(conn, profile):
+    ids = load_profiles(conn, [profile] * 5, batch_size=2)
+
+    assert len(ids) == 5
+    assert row_count(conn, "executives") == 5
@@ -0,0 +1,41 @@
+import os
+
+import profile_index
+from profile_index import ProfileIndex
+
+
+def variant(profile, title, location):
+    return dict(profile, title=title, location=location)
+
+
+def test_save_appends_delta_segments_and_reloads(tmp_path, profile):
+    path = str(tmp_path / "index")
+    index = ProfileIndex()
+    index.add("cfo", variant(profile, "Alpha Officer", "Romania (Remote)"))
+    index.add("cto", variant(profile, "Beta Officer", "Germany (Hybrid)"))
+    index.save(path)
+
+    index = ProfileIndex.load(path)
+    index.add("cto", variant(profile, "Gamma Officer", "Germany (Hybrid)"))
+    index.remove("cfo")
+    index.save(path)
+
+    assert len(os.listdir(path)) == 3  # manifest + base segment + one delta
+    reloaded = ProfileIndex.load(path)
+    assert len(reloaded) == 1
+    assert reloaded.search("alpha") == []
+    assert [doc_id for doc_id, _ in reloaded.search("gamma")] == ["cto"]
+    assert reloaded.search("beta") == []
+
+
+def test_segments_are_merged_past_the_limit(tmp_path, profile, monkeypatch):
+    monkeypatch.setattr(profile_index, "MAX_SEGMENTS", 2)
+    path = str(tmp_path / "index")
+    for i in range(4):
+        index = ProfileIndex.load(path)
+        index.add(f"p{i}", variant(profile, f"Director{i}", "Romania"))
+        index.save(path)
+
+    segments = [name for name in os.listdir(path) if name.startswith("seg-")]
+    assert len(segments) <= 2
+    assert sorted(doc_id for doc_id, _ in ProfileIndex.load(path).search("director0 director1 director2 director3", k=10)) == ["p0", "p1", "p2", "p3"]
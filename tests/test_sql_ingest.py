@@ -0,0 +1,79 @@
+import copy
+import asyncio
+import sqlite3
+
+import pytest
+
+from sql_ingest import IngestService, ensure_ingest_schema, ingest_all, source_key, sqlite_pool, upsert_batch
+
+
+def row_counts(conn):
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("executives", "executive_highlights", "executive_strengths")}
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    ensure_ingest_schema(conn)
+    yield conn
+    conn.close()
+
+
+def test_rerun_is_unchanged_and_row_counts_stable(conn, profile):
+    items = [(source_key("a"), profile), (source_key("b"), profile)]
+
+    first = upsert_batch(conn, items)
+    counts = row_counts(conn)
+    second = upsert_batch(conn, items)
+
+    assert [status for _, status in first] == ["inserted", "inserted"]
+    assert [status for _, status in second] == ["unchanged", "unchanged"]
+    assert [i for i, _ in first] == [i for i, _ in second]
+    assert row_counts(conn) == counts
+
+
+def test_changed_profile_replaces_its_children(conn, profile):
+    upsert_batch(conn, [(source_key("a"), profile)])
+    changed = copy.deepcopy(profile)
+    changed["core_strengths"] = changed["core_strengths"][:1]
+
+    [(executive_id, status)] = upsert_batch(conn, [(source_key("a"), changed)])
+
+    assert status == "updated"
+    strengths = conn.execute("SELECT strength_description FROM executive_strengths WHERE executive_id = ?",
+                             (executive_id,)).fetchall()
+    assert strengths == [(changed["core_strengths"][0],)]
+    assert row_counts(conn)["executives"] == 1
+
+
+def test_repeated_key_in_one_batch_counts_once(conn, profile):
+    statuses = [status for _, status in upsert_batch(conn, [("k", profile)] * 3)]
+
+    assert statuses == ["inserted", "duplicate", "duplicate"]
+    assert row_counts(conn)["executives"] == 1
+
+
+def test_service_rerun_over_pool_is_idempotent(tmp_path, profile):
+    database = str(tmp_path / "ingest.db")
+    named = [(f"cv{i}", profile) for i in range(7)]
+
+    async def run():
+        pool = sqlite_pool(database, size=2)
+        try:
+            async with IngestService(pool, batch_size=3) as service:
+                results = await ingest_all(service, named)
+        finally:
+            pool.close()
+        return service.counts, results
+
+    first_counts, _ = asyncio.run(run())
+    second_counts, results = asyncio.run(run())
+
+    assert first_counts["inserted"] == 7
+    assert second_counts["unchanged"] == 7 and second_counts["inserted"] == 0
+    conn = sqlite3.connect(database)
+    try:
+        assert row_counts(conn)["executives"] == 7
+    finally:
+        conn.close()
@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "including", "into", "of", "on", "or",
+    "the", "to", "with", "across", "over", "up", "years", "year",
+})
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_tokens(text: str | None) -> list[str]:
+    """
+    Lowercased, accent-free word tokens without stopwords.
+
+    'Banking & Financial Services (Remote/Hybrid)' -> ['banking', 'financial', 'services', 'remote', 'hybrid']
+    """
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return [token for token in _WORD.findall(folded) if token not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token), good enough for quota and savings accounting."""
+    return len(text) // 4 + 1
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+import socketserver
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from cv_batch import add_backend_arguments, build_backend, print_backend_report
+from json_to_sql import generate_sql_script
+from pipeline import profile_paths
+from telemetry import TELEMETRY, add_telemetry_arguments, count, profiled, span
+
+# --- CONFIGURATION ---
+SOCKET_PATH = "cv_worker.sock"
+OUTPUT_DIR = "worker_output"
+POLL_SECONDS = 1.0  # inbox scan and metrics refresh interval
+OUTPUTS = ("json", "sql", "pptx")
+
+
+class Worker:
+    """
+    Everything a cold run rebuilds, built once: the backend stack (Gemini client,
+    config, cache, validator) and up to `max_templates` compiled PPTX templates,
+    lent to whichever thread is rendering (socket connections get a fresh thread each).
+    """
+
+    def __init__(self, backend, output_dir: str = OUTPUT_DIR, render_pptx: bool = True, max_templates: int = 1):
+        self.backend = backend
+        self.output_dir = output_dir
+        self.render_pptx = render_pptx
+        self.started = time.time()
+        self.jobs = 0
+        self.failures = 0
+        self.max_templates = max(1, max_templates)
+        self.compiled_templates = 0
+        self._templates = queue.Queue()
+        self._lock = threading.Lock()
+        if render_pptx:
+            # Pay for python-pptx and the template parse now, not on the first job
+            with self.template():
+                pass
+
+    @contextmanager
+    def template(self):
+        """Borrows an idle compiled template, compiling a new one only while fewer than max_templates exist."""
+        try:
+            template = self._templates.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                compile_new = self.compiled_templates < self.max_templates
+                self.compiled_templates += compile_new
+            if compile_new:
+                from json_to_pptx import CompiledTemplate
+                template = CompiledTemplate()
+            else:
+                template = self._templates.get()
+        try:
+            yield template
+        finally:
+            self._templates.put(template)
+
+    def process(self, cv_path: str, output_dir: str | None = None, profile_id: str | None = None,
+                outputs: list[str] | None = None) -> dict:
+        """Parses one CV and writes its JSON plus the requested SQL/PPTX outputs; returns their paths."""
+        output_dir = output_dir or self.output_dir
+        profile_id = profile_id or os.path.splitext(os.path.basename(cv_path))[0]
+        outputs = [o for o in (outputs or OUTPUTS) if o != "pptx" or self.render_pptx]
+        paths = profile_paths(output_dir, profile_id)
+        os.makedirs(output_dir, exist_ok=True)
+
+        with span("worker.job", profile_id=profile_id):
+            with open(cv_path, 'r', encoding='utf-8') as f:
+                data = self.backend.parse(f.read())
+            with open(paths["json"], 'w') as f:
+                f.write(json.dumps(data, indent=4))
+            if "sql" in outputs:
+                with open(paths["sql"], 'w') as f:
+                    f.write(generate_sql_script(data))
+            if "pptx" in outputs:
+                with self.template() as template:
+                    template.render(data, paths["pptx"])
+        return {name: os.path.abspath(paths[name]) for name in ("json", *outputs) if name in paths}
+
+    def handle(self, request: dict) -> dict:
+        """Answers one protocol request (see send_requests)."""
+        op = request.get("op", "process")
+        if op == "ping":
+            return {"ok": True, "uptime_seconds": round(time.time() - self.started, 1),
+                    "jobs": self.jobs, "failures": self.failures}
+        if op == "shutdown":
+            return {"ok": True}
+        if op != "process":
+            return {"ok": False, "error": f"unknown op '{op}'"}
+
+        start = time.perf_counter()
+        try:
+            paths = self.process(request["cv_path"], request.get("output_dir"), request.get("profile_id"),
+                                 request.get("outputs"))
+        except Exception as e:
+            with self._lock:
+                self.jobs += 1
+                self.failures += 1
+            count("worker_jobs_total", result="failed")
+            return {"ok": False, "cv_path": request.get("cv_path"), "error": f"{type(e).__name__}: {e}",
+                    "seconds": round(time.perf_counter() - start, 3)}
+        with self._lock:
+            self.jobs += 1
+        count("worker_jobs_total", result="ok")
+        return {"ok": True, "cv_path": request["cv_path"], "paths": paths,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, one JSON response per line; a connection may carry several."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response, request = {"ok": False, "error": f"bad request: {e}"}, {}
+            else:
+                response = self.server.worker.handle(request)
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if request.get("op") == "shutdown":
+                self.server.stop.set()
+                return
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, worker: Worker, stop: threading.Event):
+        self.worker = worker
+        self.stop = stop
+        super().__init__(socket_path, _RequestHandler)
+
+
+def _claim_socket(socket_path: str):
+    """Removes a socket file left behind by a dead worker; refuses to start next to a live one."""
+    if not os.path.exists(socket_path):
+        return
+    try:
+        send_requests([{"op": "ping"}], socket_path, timeout=2.0)
+    except OSError:
+        os.remove(socket_path)
+        return
+    raise SystemExit(f"Error: a worker is already listening on '{socket_path}'.")
+
+
+def poll_inbox(worker: Worker, inbox: str, pool: ThreadPoolExecutor) -> int:
+    """
+    Processes every *.txt CV waiting in `inbox`; returns how many were picked up.
+
+    A CV is claimed by renaming it into inbox/processing/, then moved to done/
+    or failed/ (with a .error.json next to it). Writers should create the file
+    under another name and rename it to *.txt, so half-written CVs are never picked up.
+    """
+    for name in ("processing", "done", "failed"):
+        os.makedirs(os.path.join(inbox, name), exist_ok=True)
+    claimed = []
+    for name in sorted(os.listdir(inbox)):
+        if not name.endswith(".txt"):
+            continue
+        path = os.path.join(inbox, "processing", name)
+        try:
+            os.rename(os.path.join(inbox, name), path)
+        except FileNotFoundError:
+            continue  # taken by another worker
+        claimed.append((name, path))
+
+    def run(job):
+        name, path = job
+        response = worker.handle({"cv_path": path})
+        status = "done" if response["ok"] else "failed"
+        os.replace(path, os.path.join(inbox, status, name))
+        if not response["ok"]:
+            with open(os.path.join(inbox, "failed", name + ".error.json"), 'w') as f:
+                f.write(json.dumps(response, indent=4))
+        print(f"{'✅' if response['ok'] else '❌'} inbox/{name} ({response['seconds']:.2f}s)"
+              f"{' - ' + response['error'] if not response['ok'] else ''}")
+
+    list(pool.map(run, claimed))
+    return len(claimed)
+
+
+def serve(args):
+    backend, cache, dead_letter = build_backend(args)
+    worker = Worker(backend, args.output_dir, render_pptx=not args.no_pptx, max_templates=args.concurrency)
+    stop = threading.Event()
+    TELEMETRY.configure(args.trace_log)
+
+    _claim_socket(args.socket)
+    server = WorkerServer(args.socket, worker, stop)
+    threading.Thread(target=server.serve_forever, name="socket-server", daemon=True).start()
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    print(f"--- 🛎️ CV worker ready (model {backend.model_name}) on '{args.socket}'"
+          f"{', watching ' + repr(args.inbox) if args.inbox else ''} ---")
+    try:
+        while not stop.is_set():
+            if args.inbox:
+                poll_inbox(worker, args.inbox, pool)
+            if args.metrics_file:
+                TELEMETRY.write_prometheus(args.metrics_file)
+            stop.wait(args.poll_seconds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.shutdown()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        if args.metrics_file:
+            TELEMETRY.write_prometheus(args.metrics_file)
+        TELEMETRY.close()
+    print(f"\nWorker stopped after {worker.jobs} jobs ({worker.failures} failed).")
+    print_backend_report(cache, dead_letter, backend)
+
+
+def send_requests(requests: list[dict], socket_path: str = SOCKET_PATH, timeout: float | None = None) -> list[dict]:
+    """Sends requests to a running worker over one connection and returns its responses in order."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        with sock.makefile('rwb') as stream:
+            responses = []
+            for request in requests:
+                stream.write((json.dumps(request) + "\n").encode("utf-8"))
+                stream.flush()
+                responses.append(json.loads(stream.readline()))
+            return responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running CV worker that keeps the Gemini client and template warm.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Start the worker")
+    serve_parser.add_argument("--socket", default=SOCKET_PATH)
+    serve_parser.add_argument("--inbox", help="Also process CVs dropped into this directory")
+    serve_parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    serve_parser.add_argument("--no-pptx", action="store_true", help="Only write JSON and SQL")
+    serve_parser.add_argument("--poll-seconds", type=float, default=POLL_SECONDS)
+    add_backend_arguments(serve_parser)
+    add_telemetry_arguments(serve_parser)
+    submit = commands.add_parser("submit", help="Send CVs to a running worker")
+    submit.add_argument("paths", nargs="+")
+    submit.add_argument("--socket", default=SOCKET_PATH)
+    submit.add_argument("--output-dir", help="Override the worker's output directory")
+    submit.add_argument("--outputs", nargs="+", choices=OUTPUTS[1:], help="Outputs besides the JSON (default: all)")
+    for name, help_text in (("ping", "Check that the worker is up"), ("stop", "Shut the worker down")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        with profiled(args.profile):
+            serve(args)
+        return
+    if args.command == "submit":
+        requests = [{"op": "process", "cv_path": os.path.abspath(path),
+                     "output_dir": os.path.abspath(args.output_dir) if args.output_dir else None,
+                     "outputs": ["json", *args.outputs] if args.outputs else None} for path in args.paths]
+    else:
+        requests = [{"op": "ping" if args.command == "ping" else "shutdown"}]
+    try:
+        responses = send_requests(requests, args.socket)
+    except OSError as e:
+        raise SystemExit(f"Error: no worker reachable on '{args.socket}' ({e}).")
+    for response in responses:
+        print(json.dumps(response))
+
+
+if __name__ == "__main__":
+    main()